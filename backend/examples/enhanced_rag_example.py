@@ -28,7 +28,7 @@ from src.rag import (
     is_rag_enabled,
     get_rag_tool_info
 )
-from src.agent.resource_manager import resource_manager
+from src.agent.resource_manager import get_resource_manager
 from src.agent.logging_config import RAGSystemLogger
 
 # Initialize logger
@@ -38,6 +38,7 @@ logger = RAGSystemLogger(__name__)
 def setup_example_resources():
     """Setup example RAG resources."""
     logger.log_rag_operation("SETUP_RESOURCES", {"action": "start"})
+    resource_manager = get_resource_manager()
     
     # Add some example resources
     resource_manager.add_resource(
@@ -95,6 +96,7 @@ def demonstrate_rag_configuration():
 def demonstrate_resource_management():
     """Demonstrate resource management capabilities."""
     print("=== Resource Management ===")
+    resource_manager = get_resource_manager()
     
     # List all resources
     all_resources = resource_manager.list_resources(enabled_only=False)
@@ -136,7 +138,7 @@ def demonstrate_rag_search():
         return
     
     # Get specific resources
-    specific_resources = resource_manager.get_rag_resources(["knowledge_base_1", "technical_docs"])
+    specific_resources = get_resource_manager().get_rag_resources(["knowledge_base_1", "technical_docs"])
     
     # Create RAG tool
     rag_tool = create_rag_tool(specific_resources)
@@ -3,6 +3,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from graph import research_graph as graph
+__all__ = ["get_research_graph"]
 
-__all__ = ["graph"]
+
+def get_research_graph():
+    """Return the compiled research graph; graph.py is imported on the first call."""
+    from graph import get_research_graph as _get_research_graph
+    return _get_research_graph()
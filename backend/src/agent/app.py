@@ -58,7 +58,7 @@ def create_frontend_router(build_dir="../frontend/dist"):
 async def rag_config():
     """Get the RAG configuration."""
     rag_provider = os.getenv("RAG_PROVIDER")
-    return RAGConfigResponse(provider=rag_provider)
+    return RAGConfigResponse.model_construct(provider=rag_provider)
 
 
 @app.get("/api/rag/resources", response_model=RAGResourcesResponse)
@@ -79,21 +79,21 @@ async def rag_resources(request: Annotated[RAGResourceRequest, Query()]):
             print(f"DEBUG: Retrieved {len(resources)} resources")
             for resource in resources:
                 print(f"  - {resource.title}: {resource.uri}")
-            return RAGResourcesResponse(resources=resources)
+            return RAGResourcesResponse.model_construct(resources=resources)
         except Exception as e:
             print(f"DEBUG: Error retrieving resources: {e}")
-            return RAGResourcesResponse(resources=[])
+            return RAGResourcesResponse.model_construct(resources=[])
     
     print("DEBUG: No retriever available")
-    return RAGResourcesResponse(resources=[])
+    return RAGResourcesResponse.model_construct(resources=[])
 
 
 @app.get("/api/config", response_model=ConfigResponse)
 async def config():
     """Get the application configuration."""
     rag_provider = os.getenv("RAG_PROVIDER")
-    return ConfigResponse(
-        rag=RAGConfigResponse(provider=rag_provider)
+    return ConfigResponse.model_construct(
+        rag=RAGConfigResponse.model_construct(provider=rag_provider)
     )
 
 
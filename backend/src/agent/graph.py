@@ -1,6 +1,9 @@
 """Modified LangGraph implementation supporting multiple LLM providers."""
 
+import functools
+import json
 import os
+import re
 from typing import Any, Dict, List
 
 # Use absolute imports for LangGraph compatibility
@@ -9,11 +12,12 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 import time
 
+import orjson
 from dotenv import load_dotenv
 from langchain_core.messages import AIMessage
 from langgraph.graph import StateGraph
 from langgraph.graph import START, END
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 
 from state import (
     OverallState,
@@ -24,12 +28,16 @@ from state import (
 from configuration import Configuration
 from prompts import (
     get_current_date,
-    query_writer_instructions,
-    web_searcher_instructions,
-    reflection_instructions,
-    answer_instructions,
+    render_prompt,
+    query_writer_parts,
+    query_list_suffix,
+    web_searcher_parts,
+    web_search_results_parts,
+    reflection_parts,
+    answer_parts,
+    answer_continuation_prefix,
 )
-from llm_factory import LLMFactory
+from llm_factory import LLMFactory, configure_llm_cache
 from web_search_tool import web_search_tool
 from utils import (
     get_research_topic,
@@ -37,6 +45,19 @@ from utils import (
 # Import RAG functions locally to avoid circular imports
 # from rag_nodes import rag_retrieve, should_use_rag, rag_fallback_to_web
 
+# Fenced ```json block in LLM responses
+_JSON_BLOCK_RE = re.compile(r'```json\s*\n(.*?)\n```', re.DOTALL)
+
+# Line prefixes and keywords used by the plain-text fallback parsers
+_QUERY_SKIP_PREFIXES = ('#', '//', '{', '}')
+_SUFFICIENT_PREFIXES = ('SUFFICIENT:', '1.')
+_KNOWLEDGE_GAP_PREFIXES = ('KNOWLEDGE_GAP:', '2.')
+_FOLLOW_UP_PREFIXES = ('FOLLOW_UP_QUERIES:', '3.')
+_REFLECTION_KEYWORDS = ('SUFFICIENT', 'KNOWLEDGE_GAP', 'FOLLOW_UP')
+_REFLECTION_KEYWORD_RE = re.compile('|'.join(_REFLECTION_KEYWORDS))
+_AFFIRMATIVE_RE = re.compile('yes|true', re.IGNORECASE)
+_BULLET_PREFIXES = ('-', '•')
+
 load_dotenv()
 
 # Check if any API key is available
@@ -52,6 +73,7 @@ def check_api_keys():
         raise ValueError("At least one LLM API key must be configured. Please set one of: DEEPSEEK_API_KEY, ZHIPUAI_API_KEY, QWEN_API_KEY, OPENAI_API_KEY, or LLM_API_KEY")
 
 check_api_keys()
+configure_llm_cache()
 
 
 # Nodes
@@ -81,11 +103,12 @@ def generate_query(state: OverallState, config: RunnableConfig) -> Dict[str, Any
     else:
         research_topic = get_research_topic(messages)
     
-    formatted_prompt = query_writer_instructions.format(
+    formatted_prompt = render_prompt(
+        query_writer_parts,
         current_date=current_date,
         research_topic=research_topic,
         number_queries=state["initial_search_query_count"],
-    ) + "\n\nPlease provide search queries as a simple list, one per line."
+    ) + query_list_suffix
     
     # Generate the search queries
     result = llm.invoke(formatted_prompt)
@@ -102,20 +125,17 @@ def generate_query(state: OverallState, config: RunnableConfig) -> Dict[str, Any
     # Parse the JSON response to extract queries
     queries = []
     try:
-        import json
-        import re
-        
         # Try to extract JSON from the response
-        # Look for JSON block between ```json and ```
-        json_match = re.search(r'```json\s*\n(.*?)\n```', content, re.DOTALL)
-        if json_match:
-            json_content = json_match.group(1)
-        else:
-            # Try to parse the entire content as JSON
+        if content.lstrip().startswith('{'):
+            # Bare JSON, no need to look for a code fence
             json_content = content
+        else:
+            # Look for JSON block between ```json and ```
+            json_match = _JSON_BLOCK_RE.search(content)
+            json_content = json_match.group(1) if json_match else content
         
-        # Parse JSON
-        parsed_json = json.loads(json_content)
+        # Parse JSON (orjson errors subclass json.JSONDecodeError)
+        parsed_json = orjson.loads(json_content)
         
         # Extract queries from the parsed JSON
         if isinstance(parsed_json, dict) and 'query' in parsed_json:
@@ -130,12 +150,18 @@ def generate_query(state: OverallState, config: RunnableConfig) -> Dict[str, Any
         # Fallback to original text parsing
         for line in content.strip().split('\n'):
             line = line.strip()
-            if line and not line.startswith('#') and not line.startswith('//') and not line.startswith('{') and not line.startswith('}'):
+            if line and not line.startswith(_QUERY_SKIP_PREFIXES):
                 # Remove numbering and bullet points
                 line = line.lstrip('0123456789.-• ')
                 if line and '"' not in line:  # Skip lines with quotes (likely JSON)
                     queries.append(line)
     
+    # Drop duplicates that only differ in case or whitespace, keeping order
+    unique_queries: Dict[str, str] = {}
+    for q in queries:
+        unique_queries.setdefault(q.strip().lower(), q)
+    queries = list(unique_queries.values())
+    
     # Ensure we have at least one query
     if not queries:
         queries = [research_topic]
@@ -152,21 +178,21 @@ def web_research(state: OverallState, config: RunnableConfig) -> Dict[str, Any]:
     """LangGraph node that performs web research using configured search engines."""
     configurable = Configuration.from_runnable_config(config)
     
-    # Get the current search query (handle both string and list formats)
+    # Search every pending query in one batch (handle both string and list formats)
     current_query = state["search_query"]
     if isinstance(current_query, list) and current_query:
-        # If it's a list, take the last query
-        query_text = current_query[-1] if isinstance(current_query[-1], str) else str(current_query[-1])
+        queries = [q if isinstance(q, str) else str(q) for q in current_query]
     else:
-        query_text = str(current_query)
+        queries = [str(current_query)]
     
     # Debug output
-    print(f"DEBUG: web_research called with query: {query_text}")
+    print(f"DEBUG: web_research called with queries: {queries}")
     print(f"DEBUG: web_research state search_query: {state['search_query']}")
     print(f"DEBUG: web_research state search_query type: {type(state['search_query'])}")
     
-    # Perform web search
-    search_results = web_search_tool.search(query_text, max_results=5)
+    # Perform web search; search_batch returns results per distinct query in order
+    batch_results = web_search_tool.search_batch(queries, max_results=5)
+    search_results = [result for results in batch_results.values() for result in results]
     
     # Debug output
     print(f"DEBUG: search_results from web_search_tool: {search_results}")
@@ -184,10 +210,11 @@ def web_research(state: OverallState, config: RunnableConfig) -> Dict[str, Any]:
     )
     
     # Create a prompt to analyze the search results
-    analysis_prompt = web_searcher_instructions.format(
+    analysis_prompt = render_prompt(
+        web_searcher_parts,
         current_date=get_current_date(),
         research_topic=state["search_query"],
-    ) + f"\n\nSearch Results:\n{formatted_results}\n\nPlease provide a comprehensive analysis of these search results."
+    ) + render_prompt(web_search_results_parts, search_results=formatted_results)
     
     # Get LLM analysis
     analysis_result = llm.invoke(analysis_prompt)
@@ -243,7 +270,8 @@ def reflection(state: OverallState, config: RunnableConfig) -> Dict[str, Any]:
     else:
         research_topic = get_research_topic(messages)
     
-    formatted_prompt = reflection_instructions.format(
+    formatted_prompt = render_prompt(
+        reflection_parts,
         current_date=current_date,
         research_topic=research_topic,
         summaries=summaries_text,
@@ -269,20 +297,17 @@ def reflection(state: OverallState, config: RunnableConfig) -> Dict[str, Any]:
     follow_up_queries = []
     
     try:
-        import json
-        import re
-        
         # Try to extract JSON from the response
-        # Look for JSON block between ```json and ```
-        json_match = re.search(r'```json\s*\n(.*?)\n```', content, re.DOTALL)
-        if json_match:
-            json_content = json_match.group(1)
-        else:
-            # Try to parse the entire content as JSON
+        if content.lstrip().startswith('{'):
+            # Bare JSON, no need to look for a code fence
             json_content = content
+        else:
+            # Look for JSON block between ```json and ```
+            json_match = _JSON_BLOCK_RE.search(content)
+            json_content = json_match.group(1) if json_match else content
         
-        # Parse JSON
-        parsed_json = json.loads(json_content)
+        # Parse JSON (orjson errors subclass json.JSONDecodeError)
+        parsed_json = orjson.loads(json_content)
         
         # Extract values from the parsed JSON
         is_sufficient = parsed_json.get('is_sufficient', False)
@@ -304,18 +329,19 @@ def reflection(state: OverallState, config: RunnableConfig) -> Dict[str, Any]:
         lines = content.strip().split('\n')
         for line in lines:
             line = line.strip()
-            if line.upper().startswith('SUFFICIENT:') or line.upper().startswith('1.'):
-                is_sufficient = 'yes' in line.lower() or 'true' in line.lower()
-            elif line.upper().startswith('KNOWLEDGE_GAP:') or line.upper().startswith('2.'):
+            upper_line = line.upper()
+            if upper_line.startswith(_SUFFICIENT_PREFIXES):
+                is_sufficient = _AFFIRMATIVE_RE.search(line) is not None
+            elif upper_line.startswith(_KNOWLEDGE_GAP_PREFIXES):
                 knowledge_gap = line.split(':', 1)[-1].strip()
-            elif line.upper().startswith('FOLLOW_UP_QUERIES:') or line.upper().startswith('3.'):
+            elif upper_line.startswith(_FOLLOW_UP_PREFIXES):
                 # Extract follow-up queries
                 query_text = line.split(':', 1)[-1].strip()
                 if query_text and query_text != '[list of queries if not sufficient]':
                     follow_up_queries = [q.strip() for q in query_text.split(',') if q.strip()]
-            elif line and not any(x in line.upper() for x in ['SUFFICIENT', 'KNOWLEDGE_GAP', 'FOLLOW_UP']):
+            elif line and not _REFLECTION_KEYWORD_RE.search(upper_line):
                 # Additional follow-up queries on separate lines
-                if line.startswith('-') or line.startswith('•') or line[0].isdigit():
+                if line.startswith(_BULLET_PREFIXES) or line[0].isdigit():
                     query = line.lstrip('-•0123456789. ').strip()
                     if query and isinstance(follow_up_queries, list):
                         follow_up_queries.append(query)
@@ -381,27 +407,32 @@ def finalize_answer(state: OverallState, config: RunnableConfig) -> Dict[str, An
     reasoning_model = state.get("reasoning_model") or configurable.answer_model
 
     # Combine RAG documents with web research results
-    all_summaries = []
+    rag_documents = state.get("rag_documents") or []
+    web_research_result = state.get("web_research_result") or []
     
     # Add RAG documents if available with clear labeling
-    rag_documents = state.get("rag_documents")
     if rag_documents:
         print(f"DEBUG: Adding {len(rag_documents)} RAG documents to final answer")
-        for i, doc in enumerate(rag_documents):
-            labeled_doc = f"=== KNOWLEDGE BASE SOURCE {i+1} ===\n{doc}\n=== END KNOWLEDGE BASE SOURCE {i+1} ==="
-            all_summaries.append(labeled_doc)
     else:
         print("DEBUG: No RAG documents available for final answer")
     
     # Add web research results with clear labeling
-    web_research_result = state.get("web_research_result")
     if web_research_result:
         print(f"DEBUG: Adding {len(web_research_result)} web research results to final answer")
-        for i, result in enumerate(web_research_result):
-            labeled_result = f"=== WEB RESEARCH SOURCE {i+1} ===\n{result}\n=== END WEB RESEARCH SOURCE {i+1} ==="
-            all_summaries.append(labeled_result)
     else:
         print("DEBUG: No web research results available for final answer")
+    
+    # Label every source and build the list in a single allocation
+    all_summaries = [
+        *(
+            f"=== KNOWLEDGE BASE SOURCE {i} ===\n{doc}\n=== END KNOWLEDGE BASE SOURCE {i} ==="
+            for i, doc in enumerate(rag_documents, 1)
+        ),
+        *(
+            f"=== WEB RESEARCH SOURCE {i} ===\n{result}\n=== END WEB RESEARCH SOURCE {i} ==="
+            for i, result in enumerate(web_research_result, 1)
+        ),
+    ]
 
     # Format the prompt
     current_date = get_current_date()
@@ -417,7 +448,8 @@ def finalize_answer(state: OverallState, config: RunnableConfig) -> Dict[str, An
     else:
         research_topic = get_research_topic(messages)
     
-    formatted_prompt = answer_instructions.format(
+    formatted_prompt = render_prompt(
+        answer_parts,
         current_date=current_date,
         research_topic=research_topic,
         summaries=summaries_text,
@@ -441,7 +473,7 @@ def finalize_answer(state: OverallState, config: RunnableConfig) -> Dict[str, An
         while finish_reason == "length": # 如果正常结束该值为stop
             print(f"发现未完待续，续写 ...")
             # continuation = llm.invoke([HumanMessage("请继续上文接着写")], previous_response_id=responseid) #豆包大模型多轮对话需要
-            continuation = llm.invoke("请继续上文接着写，\n 上文：" + final_answer)
+            continuation = llm.invoke(answer_continuation_prefix + final_answer)
             final_answer = final_answer + "\n" + continuation.content
             finish_reason = continuation.response_metadata["finish_reason"]
             # responseid = continuation.id #豆包大模型多轮对话需要
@@ -460,7 +492,7 @@ def finalize_answer(state: OverallState, config: RunnableConfig) -> Dict[str, An
 def build_graph():
     """Build the LangGraph research agent."""
     # Import RAG functions locally to avoid circular imports
-    from rag_nodes import rag_retrieve, should_use_rag, rag_fallback_to_web
+    from rag_nodes import rag_retrieve, arag_retrieve, should_use_rag, rag_fallback_to_web
     
     workflow = StateGraph(OverallState)
 
@@ -470,7 +502,8 @@ def build_graph():
     workflow.add_node("reflection", reflection)
     workflow.add_node("continue_research", continue_research)
     workflow.add_node("finalize_answer", finalize_answer)
-    workflow.add_node("rag_retrieve", rag_retrieve)
+    # Sync invoke runs rag_retrieve; async runs await the non-blocking arag_retrieve
+    workflow.add_node("rag_retrieve", RunnableLambda(rag_retrieve, afunc=arag_retrieve))
 
     # Add edges - Enhanced RAG integration
     workflow.add_edge(START, "generate_query")
@@ -523,5 +556,15 @@ def build_graph():
     return workflow.compile()
 
 
-# Create the compiled graph
-research_graph = build_graph() 
+@functools.lru_cache(maxsize=1)
+def get_research_graph():
+    """Return the compiled research graph, building it on first use."""
+    return build_graph()
+
+
+def __getattr__(name: str):
+    # Compile research_graph lazily so importing this module stays cheap
+    if name == "research_graph":
+        return get_research_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
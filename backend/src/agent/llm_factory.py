@@ -1,12 +1,37 @@
 """LLM Factory for supporting multiple model providers."""
 
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
 from langchain_core.language_models import BaseLanguageModel
 from langchain_openai import ChatOpenAI
 from langchain_community.chat_models import ChatZhipuAI
 
 
+def configure_llm_cache() -> None:
+    """Enable the LangChain LLM response cache selected by ``LLM_CACHE``.
+    
+    ``LLM_CACHE=memory`` keeps responses in an in-process LRU cache bounded by
+    ``LLM_CACHE_MAXSIZE``; ``LLM_CACHE=sqlite`` persists them to the SQLite
+    database at ``LLM_CACHE_PATH`` so reruns of the same topic survive
+    restarts. Cache keys include the full prompt and the model
+    parameters, so different models or temperatures never share entries.
+    Caching is disabled when the variable is unset.
+    """
+    backend = os.getenv("LLM_CACHE", "").lower()
+    if backend == "memory":
+        set_llm_cache(InMemoryCache(maxsize=int(os.getenv("LLM_CACHE_MAXSIZE", "1024"))))
+    elif backend == "sqlite":
+        from langchain_community.cache import SQLiteCache
+
+        set_llm_cache(SQLiteCache(database_path=os.getenv("LLM_CACHE_PATH", ".llm_cache.db")))
+
+
+# Clients created without extra kwargs, keyed by (model_name, temperature, max_retries)
+_LLM_POOL: Dict[Tuple[str, float, int], BaseLanguageModel] = {}
+
+
 class LLMFactory:
     """Factory class for creating LLM instances based on provider and model name."""
     
@@ -26,8 +51,25 @@ class LLMFactory:
             **kwargs: Additional arguments
             
         Returns:
-            LLM instance
+            LLM instance, shared across calls with the same arguments when no
+            extra kwargs are given so its HTTP connection pool is reused
         """
+        if kwargs:
+            return LLMFactory._build_llm(model_name, temperature, max_retries, **kwargs)
+        
+        key = (model_name, temperature, max_retries)
+        llm = _LLM_POOL.get(key)
+        if llm is None:
+            llm = _LLM_POOL.setdefault(
+                key, LLMFactory._build_llm(model_name, temperature, max_retries)
+            )
+        return llm
+    
+    @staticmethod
+    def _build_llm(
+        model_name: str, temperature: float, max_retries: int, **kwargs
+    ) -> BaseLanguageModel:
+        """Instantiate a new LLM client for the provider matching the model name."""
         # DeepSeek models
         if model_name.startswith("deepseek"):
             return LLMFactory._create_deepseek_llm(model_name, temperature, max_retries, **kwargs)
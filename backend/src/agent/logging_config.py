@@ -3,9 +3,86 @@
 import logging
 import os
 import sys
+import time
+import weakref
 from typing import Optional
 from datetime import datetime
-from pathlib import Path
+
+
+# Log directories already created by setup_logging, so repeated calls skip the mkdir
+_ENSURED_DIRS: set[str] = set()
+
+# Third-party loggers (and their sub-loggers) that are only shown from WARNING up
+_NOISY_LOGGERS = ("httpx", "urllib3", "requests")
+_NOISY_PREFIXES = tuple(f"{name}." for name in _NOISY_LOGGERS)
+
+
+class NoisyLoggerFilter(logging.Filter):
+    """Drop sub-WARNING records emitted by noisy third-party loggers."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        name = record.name
+        return not (name in _NOISY_LOGGERS or name.startswith(_NOISY_PREFIXES))
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the asctime seconds part at most once per second."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, formatted) pair, swapped as a whole so handlers can share it
+        self._last_ts: tuple[int, str] = (-1, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        last_sec, last_str = self._last_ts
+        if sec != last_sec:
+            last_str = time.strftime(self.default_time_format, self.converter(sec))
+            self._last_ts = (sec, last_str)
+        return self.default_msec_format % (last_str, record.msecs)
+
+
+class RawBytesFileHandler(logging.Handler):
+    """File handler that appends each encoded record with a single os.write call.
+    
+    Bypasses the buffered text stream used by logging.FileHandler, and the
+    O_APPEND descriptor keeps whole records intact when several worker
+    processes share the same log file.
+    """
+    
+    def __init__(self, filename: str, encoding: str = "utf-8"):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        self._fd: Optional[int] = os.open(
+            self.baseFilename, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        # Release the descriptor even if the handler is dropped without close()
+        self._fd_finalizer = weakref.finalize(self, os.close, self._fd)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._fd is None:
+            return
+        try:
+            buf = (self.format(record) + "\n").encode(self.encoding, "replace")
+            os.write(self._fd, buf)
+        except Exception:
+            self.handleError(record)
+    
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self._fd is not None:
+                # Runs os.close at most once and detaches the GC finalizer
+                self._fd_finalizer()
+                self._fd = None
+        finally:
+            self.release()
+        super().close()
 
 
 def setup_logging(
@@ -37,39 +114,46 @@ def setup_logging(
     
     # Ensure log directory exists
     if enable_file and log_file:
-        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        log_dir = os.path.dirname(log_file)
+        if log_dir and log_dir not in _ENSURED_DIRS:
+            os.makedirs(log_dir, exist_ok=True)
+            _ENSURED_DIRS.add(log_dir)
     
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level))
     
-    # Clear existing handlers
+    # Close and clear existing handlers so their file descriptors are released
+    for handler in root_logger.handlers[:]:
+        handler.close()
     root_logger.handlers.clear()
     
-    # Create formatter
-    formatter = logging.Formatter(log_format)
+    # Create formatter and the shared third-party noise filter
+    formatter = CachedTimeFormatter(log_format)
+    noise_filter = NoisyLoggerFilter()
     
     # Add console handler
     if enable_console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, log_level))
         console_handler.setFormatter(formatter)
+        console_handler.addFilter(noise_filter)
         root_logger.addHandler(console_handler)
     
     # Add file handler
     if enable_file and log_file:
         try:
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler = RawBytesFileHandler(log_file, encoding='utf-8')
             file_handler.setLevel(getattr(logging, log_level))
             file_handler.setFormatter(formatter)
+            file_handler.addFilter(noise_filter)
             root_logger.addHandler(file_handler)
         except Exception as e:
             print(f"Failed to setup file logging: {e}")
     
     # Set specific logger levels
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("requests").setLevel(logging.WARNING)
+    for name in _NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
     
     # Log startup message
     root_logger.info(f"Logging configured - Level: {log_level}, Console: {enable_console}, File: {enable_file}")
@@ -126,8 +210,12 @@ class RAGSystemLogger:
     
     def log_performance(self, operation: str, duration: float, details: Optional[dict] = None):
         """Log performance metrics."""
-        details = details or {}
-        details["duration_ms"] = round(duration * 1000, 2)
+        if details is None:
+            self.logger.info(
+                "RAG Operation: PERFORMANCE_%s - duration_ms=%.2f", operation, duration * 1000.0
+            )
+            return
+        details = {**details, "duration_ms": round(duration * 1000, 2)}
         self.log_rag_operation(f"PERFORMANCE_{operation}", details)
     
     def log_config_change(self, config_name: str, old_value: str, new_value: str):
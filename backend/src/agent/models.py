@@ -1,4 +1,8 @@
-"""Data models for API requests and responses."""
+"""Data models for API requests and responses.
+
+Response models are built server-side from trusted data, so handlers create
+them with ``model_construct`` and skip a validation pass per request.
+"""
 
 from typing import List, Optional
 from pydantic import BaseModel
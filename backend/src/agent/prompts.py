@@ -1,9 +1,16 @@
-from datetime import datetime
+import string
+from datetime import date
+from functools import lru_cache
 
 
-# Get current date in a readable format
+@lru_cache(maxsize=1)
+def _format_date(ordinal: int) -> str:
+    return date.fromordinal(ordinal).strftime("%B %d, %Y")
+
+
+# Get current date in a readable format (formatted once per day)
 def get_current_date():
-    return datetime.now().strftime("%B %d, %Y")
+    return _format_date(date.today().toordinal())
 
 
 query_writer_instructions = """Your goal is to generate sophisticated and diverse web search queries. These queries are intended for an advanced automated web research tool capable of analyzing complex results, following links, and synthesizing information.
@@ -33,6 +40,8 @@ Topic: What revenue grew more last year apple stock or the number of people buyi
 
 Context: {research_topic}"""
 
+query_list_suffix = "\n\nPlease provide search queries as a simple list, one per line."
+
 
 web_searcher_instructions = """Conduct targeted Google Searches to gather the most recent, credible information on "{research_topic}" and synthesize it into a verifiable text artifact.
 
@@ -47,6 +56,13 @@ Research Topic:
 {research_topic}
 """
 
+web_search_results_suffix = """
+
+Search Results:
+{search_results}
+
+Please provide a comprehensive analysis of these search results."""
+
 reflection_instructions = """You are an expert research assistant analyzing summaries about "{research_topic}".
 
 Instructions:
@@ -134,3 +150,26 @@ Generate a detailed, well-structured research report with the following sections
 {summaries}
 
 Generate your comprehensive research report now:"""
+
+# Prefix for follow-up requests when the answer was cut off by the length limit
+answer_continuation_prefix = "请继续上文接着写，\n 上文："
+
+
+# Templates split once into (literal, field) pairs so each render is a plain join
+def _parse_template(template):
+    return tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(template))
+
+
+def render_prompt(parts, **kwargs):
+    """Render a pre-parsed template; equivalent to template.format(**kwargs)."""
+    return "".join(
+        literal + str(kwargs[field]) if field is not None else literal
+        for literal, field in parts
+    )
+
+
+query_writer_parts = _parse_template(query_writer_instructions)
+web_searcher_parts = _parse_template(web_searcher_instructions)
+web_search_results_parts = _parse_template(web_search_results_suffix)
+reflection_parts = _parse_template(reflection_instructions)
+answer_parts = _parse_template(answer_instructions)
@@ -1,28 +1,63 @@
 """RAG integration nodes for the LangGraph agent."""
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 from langchain_core.runnables import RunnableConfig
 
-from rag import create_rag_tool, Resource, is_rag_enabled, rag_config
+from rag._cache import LRUCache
+from rag import (
+    create_rag_tool,
+    Resource,
+    is_rag_enabled,
+    invalidate_rag_enabled_cache,
+    invalidate_retriever_cache,
+    invalidate_rag_tool_cache,
+    rag_config,
+    RAGSearchResult,
+    RAGSearchTool,
+)
 # Import state and utils locally to avoid circular imports
 # from src.agent.state import OverallState, create_rag_resources
 # from src.agent.utils import get_research_topic
 
 logger = logging.getLogger(__name__)
 
+# RAG settings resolved once at import; call refresh_rag_cache() after reconfiguring
+_RAG_ENABLED = is_rag_enabled()
+_MAX_DOCUMENTS = rag_config.max_documents
+_ENABLE_FALLBACK = rag_config.enable_fallback
 
-def rag_retrieve(state, config: RunnableConfig) -> Dict[str, Any]:
-    """LangGraph node that retrieves documents from RAG sources.
-    
-    Enhanced version that uses the new RAG tool architecture with better error handling.
+# Successful retrieval results keyed by (resource URIs, normalized topic)
+_rag_result_cache: LRUCache[str] = LRUCache(maxsize=512, ttl=rag_config.query_cache_ttl)
+
+
+def refresh_rag_cache() -> None:
+    """Re-read the RAG settings and drop the retriever, tools and results built from the old ones."""
+    global _RAG_ENABLED, _MAX_DOCUMENTS, _ENABLE_FALLBACK, _rag_result_cache
+    invalidate_rag_enabled_cache()
+    invalidate_retriever_cache()
+    invalidate_rag_tool_cache()
+    _RAG_ENABLED = is_rag_enabled()
+    _MAX_DOCUMENTS = rag_config.max_documents
+    _ENABLE_FALLBACK = rag_config.enable_fallback
+    # A new cache rather than clear(), so a changed query_cache_ttl takes effect
+    _rag_result_cache = LRUCache(maxsize=512, ttl=rag_config.query_cache_ttl)
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (case and whitespace insensitive)."""
+    return " ".join(query.split()).lower()
+
+
+def _prepare_retrieval(
+    state,
+) -> Union[Dict[str, Any], Tuple[RAGSearchTool, str, Tuple[Tuple[str, ...], str]]]:
+    """Resolve the tool, topic and cache key for a retrieval.
     
-    Args:
-        state: Current graph state containing the research topic and RAG resources
-        config: Configuration for the runnable
-        
     Returns:
-        Dictionary with state update, including rag_documents with retrieved content
+        The final state update when retrieval can be answered without a search
+        (RAG disabled, no topic, no tool or a cache hit), otherwise the
+        (rag_tool, research_topic, cache_key) triple to search with
     """
     # Import locally to avoid circular imports
     from state import create_rag_resources
@@ -31,7 +66,7 @@ def rag_retrieve(state, config: RunnableConfig) -> Dict[str, Any]:
     logger.info("Starting RAG retrieval")
     
     # Check if RAG is enabled
-    if not is_rag_enabled():
+    if not _RAG_ENABLED:
         logger.info("RAG is not enabled, skipping retrieval")
         return {"rag_documents": [], "rag_enabled": False}
     
@@ -43,43 +78,89 @@ def rag_retrieve(state, config: RunnableConfig) -> Dict[str, Any]:
         logger.warning("No research topic found in messages")
         return {"rag_documents": [], "rag_enabled": True}
     
-    # Convert URIs to Resource objects
-    resources = []
-    resource_uris = state.get("rag_resources", [])
+    # Resource URIs key the result cache
+    resource_uris = tuple(sorted(state.get("rag_resources") or ()))
     if resource_uris:
-        resources = create_rag_resources(resource_uris)
-        logger.info(f"Using {len(resources)} RAG resources")
+        logger.info("Using %d RAG resources", len(resource_uris))
     else:
         logger.info("No specific RAG resources provided, using default search")
     
-    # Create RAG tool
-    rag_tool = create_rag_tool(resources)
+    # Get the RAG tool for these resources (cached by create_rag_tool)
+    rag_tool = create_rag_tool(create_rag_resources(list(resource_uris)))
     if not rag_tool:
         logger.error("Failed to create RAG tool")
         return {"rag_documents": [], "rag_enabled": True}
     
+    # Serve repeated topics over the same resources from the result cache
+    cache_key = (resource_uris, _normalize_query(research_topic))
+    cached_result = _rag_result_cache.get(cache_key)
+    if cached_result is not None:
+        logger.info("RAG search served from cache")
+        return {"rag_documents": [cached_result], "rag_enabled": True}
+    
+    logger.info("Performing RAG search for: %s", research_topic)
+    return rag_tool, research_topic, cache_key
+
+
+def _finish_retrieval(result: RAGSearchResult, cache_key: Tuple[Tuple[str, ...], str]) -> Dict[str, Any]:
+    """Turn a search result into the state update, caching successful results."""
+    if result.status == "ok":
+        logger.info("RAG search completed successfully")
+        _rag_result_cache.set(cache_key, result.content)
+        return {"rag_documents": [result.content], "rag_enabled": True}
+    
+    if result.status == "empty":
+        logger.warning("RAG search returned no results: %s", result.content)
+    else:
+        logger.error("RAG search failed: %s", result.content)
+    return {"rag_documents": [], "rag_enabled": True}
+
+
+def rag_retrieve(state, config: RunnableConfig) -> Dict[str, Any]:
+    """LangGraph node that retrieves documents from RAG sources.
+    
+    Enhanced version that uses the new RAG tool architecture with better error handling.
+    
+    Args:
+        state: Current graph state containing the research topic and RAG resources
+        config: Configuration for the runnable
+        
+    Returns:
+        Dictionary with state update, including rag_documents with retrieved content
+    """
+    prepared = _prepare_retrieval(state)
+    if isinstance(prepared, dict):
+        return prepared
+    rag_tool, research_topic, cache_key = prepared
+    
     try:
         # Perform RAG retrieval using the tool
-        logger.info(f"Performing RAG search for: {research_topic}")
-        result = rag_tool.invoke({
-            "query": research_topic,
-            "max_results": rag_config.max_documents
-        })
-        
-        if isinstance(result, str):
-            if "No relevant information found" in result or "not configured" in result:
-                logger.warning(f"RAG search returned no results: {result}")
-                return {"rag_documents": [], "rag_enabled": True}
-            else:
-                logger.info("RAG search completed successfully")
-                return {"rag_documents": [result], "rag_enabled": True}
-        else:
-            logger.warning(f"Unexpected RAG tool result type: {type(result)}")
-            return {"rag_documents": [], "rag_enabled": True}
-            
+        result = rag_tool.search(research_topic, _MAX_DOCUMENTS)
     except Exception as e:
-        logger.error(f"Error during RAG retrieval: {e}")
+        logger.error("Error during RAG retrieval: %s", e)
         return {"rag_documents": [], "rag_enabled": True}
+    
+    return _finish_retrieval(result, cache_key)
+
+
+async def arag_retrieve(state, config: RunnableConfig) -> Dict[str, Any]:
+    """Async variant of rag_retrieve used when the graph runs on an event loop.
+    
+    The search awaits the retriever's async HTTP client, so the event loop
+    stays free to serve other runs while the request is in flight.
+    """
+    prepared = _prepare_retrieval(state)
+    if isinstance(prepared, dict):
+        return prepared
+    rag_tool, research_topic, cache_key = prepared
+    
+    try:
+        result = await rag_tool.asearch(research_topic, _MAX_DOCUMENTS)
+    except Exception as e:
+        logger.error("Error during RAG retrieval: %s", e)
+        return {"rag_documents": [], "rag_enabled": True}
+    
+    return _finish_retrieval(result, cache_key)
 
 
 def has_rag_resources(state) -> bool:
@@ -96,22 +177,13 @@ def should_use_rag(state) -> str:
     Returns:
         "rag_retrieve" if RAG should be used, "web_research" otherwise
     """
-    # Check if RAG is enabled globally
-    if not is_rag_enabled():
-        logger.info("RAG is not enabled, routing to web research")
-        return "web_research"
-    
-    # Check if user has specified RAG resources
-    if has_rag_resources(state):
-        logger.info("RAG resources found, routing to RAG retrieval")
-        return "rag_retrieve"
-    
-    # Check if RAG is configured for general use
-    if rag_config.enabled:
-        logger.info("RAG is enabled for general use, routing to RAG retrieval")
+    # is_rag_enabled() implies rag_config.enabled, so with RAG on every state
+    # routes to retrieval whether or not it names specific resources
+    if _RAG_ENABLED:
+        logger.info("RAG is enabled, routing to RAG retrieval")
         return "rag_retrieve"
     
-    logger.info("No RAG configuration found, routing to web research")
+    logger.info("RAG is not enabled, routing to web research")
     return "web_research"
 
 
@@ -137,7 +209,7 @@ def rag_fallback_to_web(state) -> str:
     
     # For initial research: always do web search if fallback is enabled (regardless of RAG success)
     # This ensures comprehensive information gathering from both RAG and web sources
-    if rag_config.enable_fallback:
+    if _ENABLE_FALLBACK:
         if rag_documents:
             logger.info("RAG documents found, but also performing web search for comprehensive coverage")
         else:
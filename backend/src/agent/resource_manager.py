@@ -1,18 +1,23 @@
 """Resource management for RAG system."""
 
 import logging
+import re
 from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-import json
 import os
 
+import orjson
+
 from src.rag import Resource, is_rag_enabled, rag_config
 
 logger = logging.getLogger(__name__)
 
+# Same acceptance rule as str.startswith("rag://"); match() anchors at the start
+_RAG_URI_RE = re.compile(r"rag://")
+
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class ResourceConfig:
     """Configuration for a RAG resource."""
     name: str
@@ -20,9 +25,10 @@ class ResourceConfig:
     title: str
     description: str = ""
     enabled: bool = True
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
     
     def __post_init__(self):
+        # Config files may still carry an explicit "metadata": null
         if self.metadata is None:
             self.metadata = {}
 
@@ -33,48 +39,66 @@ class ResourceManager:
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path or os.getenv("RAG_RESOURCES_CONFIG", "resources.json")
         self.resources: Dict[str, ResourceConfig] = {}
+        # Serialized resources as last loaded from or written to the config file
+        self._saved_snapshot: Optional[bytes] = None
         self.load_resources()
     
     def load_resources(self) -> None:
-        """Load resources from configuration file."""
+        """Load resources from configuration file; skipped entirely when RAG is disabled."""
+        if not is_rag_enabled():
+            logger.info("RAG is disabled, not loading resources from %s", self.config_path)
+            return
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for resource_data in data.get('resources', []):
-                        resource_config = ResourceConfig(**resource_data)
-                        self.resources[resource_config.name] = resource_config
-                logger.info(f"Loaded {len(self.resources)} resources from {self.config_path}")
+            config_file = Path(self.config_path)
+            if config_file.exists():
+                data = orjson.loads(config_file.read_bytes())
+                for resource_data in data.get('resources', []):
+                    resource_config = ResourceConfig(**resource_data)
+                    self.resources[resource_config.name] = resource_config
+                self._saved_snapshot = self._serialize()
+                logger.info("Loaded %d resources from %s", len(self.resources), self.config_path)
             else:
-                logger.info(f"No resource configuration file found at {self.config_path}")
+                logger.info("No resource configuration file found at %s", self.config_path)
         except Exception as e:
-            logger.error(f"Failed to load resources: {e}")
+            logger.error("Failed to load resources: %s", e)
+    
+    def _serialize(self) -> bytes:
+        """Render the current resources in the config file format."""
+        data = {
+            'resources': [
+                {
+                    'name': resource.name,
+                    'uri': resource.uri,
+                    'title': resource.title,
+                    'description': resource.description,
+                    'enabled': resource.enabled,
+                    'metadata': resource.metadata
+                }
+                for resource in self.resources.values()
+            ]
+        }
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
     
     def save_resources(self) -> None:
-        """Save resources to configuration file."""
+        """Save resources to configuration file, skipping the write when nothing changed.
+        
+        Changes are detected by comparing against the last loaded or saved
+        content, so in-place edits to a ResourceConfig are saved too.
+        """
         try:
-            data = {
-                'resources': [
-                    {
-                        'name': resource.name,
-                        'uri': resource.uri,
-                        'title': resource.title,
-                        'description': resource.description,
-                        'enabled': resource.enabled,
-                        'metadata': resource.metadata
-                    }
-                    for resource in self.resources.values()
-                ]
-            }
+            config_file = Path(self.config_path)
+            snapshot = self._serialize()
+            if snapshot == self._saved_snapshot and config_file.exists():
+                return
             
             # Ensure directory exists
-            Path(self.config_path).parent.mkdir(parents=True, exist_ok=True)
+            config_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved {len(self.resources)} resources to {self.config_path}")
+            config_file.write_bytes(snapshot)
+            self._saved_snapshot = snapshot
+            logger.info("Saved %d resources to %s", len(self.resources), self.config_path)
         except Exception as e:
-            logger.error(f"Failed to save resources: {e}")
+            logger.error("Failed to save resources: %s", e)
     
     def add_resource(self, name: str, uri: str, title: str, description: str = "", 
                     enabled: bool = True, metadata: Optional[Dict[str, Any]] = None) -> None:
@@ -88,13 +112,13 @@ class ResourceManager:
             metadata=metadata or {}
         )
         self.resources[name] = resource_config
-        logger.info(f"Added resource: {name}")
+        logger.info("Added resource: %s", name)
     
     def remove_resource(self, name: str) -> bool:
         """Remove a resource."""
         if name in self.resources:
             del self.resources[name]
-            logger.info(f"Removed resource: {name}")
+            logger.info("Removed resource: %s", name)
             return True
         return False
     
@@ -104,6 +128,8 @@ class ResourceManager:
     
     def list_resources(self, enabled_only: bool = True) -> List[ResourceConfig]:
         """List all resources."""
+        # Enabled flags are read at call time, so a ResourceConfig toggled in
+        # place is never served from a stale index
         if enabled_only:
             return [r for r in self.resources.values() if r.enabled]
         return list(self.resources.values())
@@ -111,16 +137,17 @@ class ResourceManager:
     def get_rag_resources(self, resource_names: Optional[List[str]] = None) -> List[Resource]:
         """Get Resource objects for RAG system."""
         if resource_names:
-            # Get specific resources
+            # Get specific resources with a dict lookup each rather than a full scan
             configs = [self.resources.get(name) for name in resource_names]
-            configs = [c for c in configs if c and c.enabled]
+            configs = [c for c in configs if c is not None and c.enabled]
         else:
             # Get all enabled resources
             configs = self.list_resources(enabled_only=True)
         
         resources = []
         for config in configs:
-            resource = Resource(
+            # ResourceConfig fields are already typed, so skip revalidation
+            resource = Resource.model_construct(
                 uri=config.uri,
                 title=config.title,
                 description=config.description
@@ -134,12 +161,16 @@ class ResourceManager:
         issues = {}
         
         for name, resource in self.resources.items():
+            # Fast path for well-formed resources
+            if resource.title and _RAG_URI_RE.match(resource.uri):
+                continue
+            
             resource_issues = []
             
             # Check URI format
             if not resource.uri:
                 resource_issues.append("URI is empty")
-            elif not resource.uri.startswith("rag://"):
+            elif not _RAG_URI_RE.match(resource.uri):
                 resource_issues.append("URI should start with 'rag://'")
             
             # Check title
@@ -153,7 +184,7 @@ class ResourceManager:
     
     def get_resource_stats(self) -> Dict[str, Any]:
         """Get statistics about managed resources."""
-        enabled_count = len(self.list_resources(enabled_only=True))
+        enabled_count = sum(1 for r in self.resources.values() if r.enabled)
         total_count = len(self.resources)
         
         return {
@@ -165,15 +196,23 @@ class ResourceManager:
         }
 
 
-# Global resource manager instance
-resource_manager = ResourceManager()
+# Global resource manager instance, created on first use
+_resource_manager: Optional[ResourceManager] = None
+
+
+def get_resource_manager() -> ResourceManager:
+    """Get the global resource manager, loading the resource config on first call."""
+    global _resource_manager
+    if _resource_manager is None:
+        _resource_manager = ResourceManager()
+    return _resource_manager
 
 
 def get_default_resources() -> List[Resource]:
     """Get default resources from resource manager."""
-    return resource_manager.get_rag_resources()
+    return get_resource_manager().get_rag_resources()
 
 
 def get_resources_by_names(names: List[str]) -> List[Resource]:
     """Get specific resources by names."""
-    return resource_manager.get_rag_resources(names) 
\ No newline at end of file
+    return get_resource_manager().get_rag_resources(names) 
\ No newline at end of file
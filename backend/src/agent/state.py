@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
 from typing import TypedDict, List, Optional, Dict, Any
 from typing_extensions import Annotated
 from langchain_core.messages import BaseMessage
@@ -84,9 +83,8 @@ class RAGState(TypedDict):
     rag_enabled: Optional[bool]
 
 
-@dataclass(kw_only=True)
-class SearchStateOutput:
-    running_summary: Optional[str] = field(default=None)  # Final report
+class SearchStateOutput(TypedDict, total=False):
+    running_summary: Optional[str]  # Final report
 
 
 def create_rag_resources(uris: List[str]) -> List[Resource]:
@@ -98,15 +96,8 @@ def create_rag_resources(uris: List[str]) -> List[Resource]:
     Returns:
         List of Resource objects
     """
-    resources = []
-    for uri in uris:
-        resource = Resource(
-            uri=uri,
-            title=f"Resource {uri}",
-            description=""
-        )
-        resources.append(resource)
-    return resources
+    # URIs come from graph state set by the server, so skip validation
+    return [Resource.model_construct(uri=uri, title=uri, description="") for uri in uris]
 
 
 def get_combined_research_content(state: OverallState) -> List[str]:
@@ -118,16 +109,5 @@ def get_combined_research_content(state: OverallState) -> List[str]:
     Returns:
         Combined list of research content
     """
-    content = []
-    
-    # Add RAG documents if available
-    rag_documents = state.get("rag_documents")
-    if rag_documents:
-        content.extend(rag_documents)
-    
-    # Add web research results
-    web_research_result = state.get("web_research_result")
-    if web_research_result:
-        content.extend(web_research_result)
-    
-    return content
+    # RAG documents first, then web research results
+    return [*(state.get("rag_documents") or ()), *(state.get("web_research_result") or ())]
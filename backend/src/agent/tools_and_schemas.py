@@ -1,7 +1,7 @@
 """Tools and schemas for the LangGraph agent."""
 
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_core.tools import BaseTool
 
 from src.rag import create_rag_tool, Resource, is_rag_enabled
@@ -9,11 +9,15 @@ from src.rag import create_rag_tool, Resource, is_rag_enabled
 
 class SearchQueryList(BaseModel):
     """Schema for multiple search queries."""
+    model_config = ConfigDict(frozen=True)
+    
     queries: List[str] = Field(description="List of search queries to execute")
 
 
 class Reflection(BaseModel):
     """Schema for reflection on research completeness."""
+    model_config = ConfigDict(frozen=True)
+    
     is_sufficient: bool = Field(description="Whether the research is sufficient")
     knowledge_gap: str = Field(description="Description of knowledge gaps if any")
     follow_up_queries: List[str] = Field(description="Follow-up queries to address gaps")
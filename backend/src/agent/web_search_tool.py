@@ -1,21 +1,116 @@
 """Web search tool for performing web searches using various search engines."""
 
+import logging
 import os
-import json
-import requests
-from typing import List, Dict, Any
-from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import parse_qs, quote_plus, urlparse
+
+from rag._cache import LRUCache
+from rag._http import build_session
+
+logger = logging.getLogger(__name__)
+
+# Per-engine (results list key, snippet key, url key) in the API response
+_RESULT_FIELDS = {
+    "tavily": ("results", "content", "url"),
+    "serper": ("organic", "snippet", "link"),
+    "google": ("items", "snippet", "link"),
+}
+
+# Upper bound on concurrent requests when an engine has no batch endpoint
+_MAX_BATCH_WORKERS = 8
+
+# Search results are reused for an hour; empty results (usually a failed API
+# call) only for a minute so transient errors are retried soon
+_RESULT_CACHE_TTL = 3600
+_EMPTY_RESULT_CACHE_TTL = 60
+
+# The HTML endpoint rejects requests without a browser-like user agent
+_DUCKDUCKGO_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; research-agent)"}
+
+
+def _duckduckgo_url(query: str) -> str:
+    return f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
+
+
+def _duckduckgo_fallback(query: str) -> List[Dict[str, Any]]:
+    """Single link to the DuckDuckGo results page, used when scraping fails."""
+    return [
+        {
+            "title": f"Search results for: {query}",
+            "snippet": "DuckDuckGo search result (fallback mode)",
+            "url": _duckduckgo_url(query),
+            "source": "duckduckgo"
+        }
+    ]
+
+
+def _parse_duckduckgo_html(html: str, max_results: int) -> List[Dict[str, Any]]:
+    """Extract results from a DuckDuckGo HTML results page with selectolax."""
+    # The lexbor backend; the older modest HTMLParser is rejected by selectolax 1.0
+    from selectolax.lexbor import LexborHTMLParser
+    
+    results = []
+    for node in LexborHTMLParser(html).css(".result"):
+        link = node.css_first("a.result__a")
+        if link is None:
+            continue
+        href = link.attributes.get("href") or ""
+        # Result links go through a redirect that carries the target in "uddg"
+        target = parse_qs(urlparse(href).query).get("uddg")
+        snippet = node.css_first(".result__snippet")
+        results.append({
+            "title": link.text(strip=True),
+            "snippet": snippet.text(strip=True) if snippet is not None else "",
+            "url": target[0] if target else href,
+            "source": "duckduckgo"
+        })
+        if len(results) >= max_results:
+            break
+    return results
+
+
+@dataclass(frozen=True)
+class SearchConfig:
+    """Search engine settings, read from the environment once per process."""
+    search_engine: str = "duckduckgo"
+    tavily_api_key: Optional[str] = None
+    serper_api_key: Optional[str] = None
+    google_api_key: Optional[str] = None
+    google_cse_id: Optional[str] = None
+    
+    @classmethod
+    def from_env(cls) -> "SearchConfig":
+        """Build the config from SEARCH_ENGINE and the per-engine API key variables."""
+        return cls(
+            search_engine=os.getenv("SEARCH_ENGINE", "duckduckgo"),
+            tavily_api_key=os.getenv("TAVILY_API_KEY"),
+            serper_api_key=os.getenv("SERPER_API_KEY"),
+            google_api_key=os.getenv("GOOGLE_API_KEY"),
+            google_cse_id=os.getenv("GOOGLE_CSE_ID"),
+        )
+
+
+search_config = SearchConfig.from_env()
 
 
 class WebSearchTool:
     """A flexible web search tool that supports multiple search engines."""
     
-    def __init__(self):
-        self.search_engine = os.getenv("SEARCH_ENGINE", "duckduckgo")
-        self.tavily_api_key = os.getenv("TAVILY_API_KEY")
-        self.serper_api_key = os.getenv("SERPER_API_KEY")
-        self.google_api_key = os.getenv("GOOGLE_API_KEY")
-        self.google_cse_id = os.getenv("GOOGLE_CSE_ID")
+    def __init__(self, config: Optional[SearchConfig] = None):
+        config = config or search_config
+        self.search_engine = config.search_engine
+        self.tavily_api_key = config.tavily_api_key
+        self.serper_api_key = config.serper_api_key
+        self.google_api_key = config.google_api_key
+        self.google_cse_id = config.google_cse_id
+        # Pooled connections reuse TCP/TLS across searches
+        self._session = build_session()
+        # Responses keyed by (engine, normalized query, max_results)
+        self._cache: LRUCache[List[Dict[str, Any]]] = LRUCache(maxsize=1024, ttl=_RESULT_CACHE_TTL)
     
     def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -28,121 +123,177 @@ class WebSearchTool:
         Returns:
             List of search results with title, snippet, and url
         """
-        if self.search_engine == "tavily" and self.tavily_api_key:
-            return self._search_tavily(query, max_results)
-        elif self.search_engine == "serper" and self.serper_api_key:
-            return self._search_serper(query, max_results)
-        elif self.search_engine == "google" and self.google_api_key and self.google_cse_id:
-            return self._search_google(query, max_results)
+        key = self._cache_key(query, max_results)
+        results = self._cache.get(key)
+        if results is None:
+            results = self._fetch(query, max_results)
+            self._store(key, results)
+        return self._with_fallback(query, max_results, results)
+    
+    def search_batch(self, queries: List[str], max_results: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search several queries at once, sharing one request where the engine allows it.
+        
+        Duplicate queries are searched once and cached queries are not re-sent.
+        Serper receives all remaining queries in a single array request; other
+        engines are queried concurrently.
+        
+        Args:
+            queries: The search queries
+            max_results: Maximum number of results to return per query
+            
+        Returns:
+            Mapping of each distinct query to its search results, in the order
+            the queries were first given
+        """
+        # Placeholders fix the output order before cached and fetched results are filled in
+        results: Dict[str, List[Dict[str, Any]]] = dict.fromkeys(queries, [])
+        misses = []
+        for query in results:
+            cached = self._cache.get(self._cache_key(query, max_results))
+            if cached is None:
+                misses.append(query)
+            else:
+                results[query] = self._with_fallback(query, max_results, cached)
+        
+        if not misses:
+            return results
+        
+        if self.search_engine == "serper" and self.serper_api_key:
+            fetched = self._fetch_serper_batch(misses, max_results)
         else:
-            return self._search_duckduckgo(query, max_results)
+            with ThreadPoolExecutor(max_workers=min(_MAX_BATCH_WORKERS, len(misses))) as pool:
+                fetched = list(pool.map(lambda query: self._fetch(query, max_results), misses))
+        
+        for query, query_results in zip(misses, fetched):
+            self._store(self._cache_key(query, max_results), query_results)
+            results[query] = self._with_fallback(query, max_results, query_results)
+        return results
     
-    def _search_tavily(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        """Search using Tavily API."""
+    def _fetch_serper_batch(self, queries: List[str], max_results: int) -> List[List[Dict[str, Any]]]:
+        """Send all queries to Serper in one array request, one result list per query."""
         try:
-            url = "https://api.tavily.com/search"
-            headers = {"Content-Type": "application/json"}
-            data = {
-                "api_key": self.tavily_api_key,
-                "query": query,
-                "max_results": max_results,
-                "search_depth": "advanced"
-            }
-            
-            response = requests.post(url, json=data, headers=headers, timeout=30)
+            response = self._session.post(
+                "https://google.serper.dev/search",
+                headers={
+                    "X-API-KEY": self.serper_api_key,
+                    "Content-Type": "application/json"
+                },
+                json=[{"q": query, "num": max_results} for query in queries],
+                timeout=30,
+            )
             response.raise_for_status()
-            
-            results = response.json().get("results", [])
-            return [
-                {
-                    "title": result.get("title", ""),
-                    "snippet": result.get("content", ""),
-                    "url": result.get("url", ""),
-                    "source": "tavily"
-                }
-                for result in results
-            ]
+            return [self._parse_results("serper", payload) for payload in orjson.loads(response.content)]
         except Exception as e:
-            print(f"Tavily search failed: {e}")
-            return []
+            logger.error("Serper batch search failed: %s", e)
+            return [[] for _ in queries]
+    
+    def invalidate(self, query: Optional[str] = None, max_results: int = 5) -> None:
+        """Drop cached results for one query, or the whole cache when query is None."""
+        if query is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self._cache_key(query, max_results))
+    
+    def _cache_key(self, query: str, max_results: int) -> Tuple[str, str, int]:
+        return self.search_engine, " ".join(query.split()).lower(), max_results
+    
+    def _store(self, key: Tuple[str, str, int], results: List[Dict[str, Any]]) -> None:
+        self._cache.set(key, results, ttl=None if results else _EMPTY_RESULT_CACHE_TTL)
+    
+    def _with_fallback(
+        self, query: str, max_results: int, results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Replace a failed DuckDuckGo search with a link to its results page.
+        
+        Applied after caching, so the failure is stored as an empty result with
+        the short TTL rather than as the stub.
+        """
+        if results or self._build_request(query, max_results) is not None:
+            return results
+        return _duckduckgo_fallback(query)
     
-    def _search_serper(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        """Search using Serper API."""
+    def _fetch(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Run the search against the configured engine, bypassing the cache."""
+        request = self._build_request(query, max_results)
+        if request is None:
+            return self._search_duckduckgo(query, max_results)
+        
+        engine, method, url, kwargs = request
         try:
-            url = "https://google.serper.dev/search"
-            headers = {
-                "X-API-KEY": self.serper_api_key,
-                "Content-Type": "application/json"
-            }
-            data = {
-                "q": query,
-                "num": max_results
-            }
-            
-            response = requests.post(url, json=data, headers=headers, timeout=30)
+            response = self._session.request(method, url, timeout=30, **kwargs)
             response.raise_for_status()
-            
-            results = response.json().get("organic", [])
-            return [
-                {
-                    "title": result.get("title", ""),
-                    "snippet": result.get("snippet", ""),
-                    "url": result.get("link", ""),
-                    "source": "serper"
-                }
-                for result in results
-            ]
+            return self._parse_results(engine, orjson.loads(response.content))
         except Exception as e:
-            print(f"Serper search failed: {e}")
+            logger.error("%s search failed: %s", engine.capitalize(), e)
             return []
     
-    def _search_google(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        """Search using Google Custom Search API."""
-        try:
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                "key": self.google_api_key,
-                "cx": self.google_cse_id,
-                "q": query,
-                "num": min(max_results, 10)
+    def _build_request(
+        self, query: str, max_results: int
+    ) -> Optional[Tuple[str, str, str, Dict[str, Any]]]:
+        """Build (engine, method, url, request kwargs) for the configured search API.
+        
+        Returns None when no API engine is configured and DuckDuckGo should be used.
+        """
+        if self.search_engine == "tavily" and self.tavily_api_key:
+            return "tavily", "POST", "https://api.tavily.com/search", {
+                "headers": {"Content-Type": "application/json"},
+                "json": {
+                    "api_key": self.tavily_api_key,
+                    "query": query,
+                    "max_results": max_results,
+                    "search_depth": "advanced"
+                },
             }
-            
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            results = response.json().get("items", [])
-            return [
-                {
-                    "title": result.get("title", ""),
-                    "snippet": result.get("snippet", ""),
-                    "url": result.get("link", ""),
-                    "source": "google"
-                }
-                for result in results
-            ]
-        except Exception as e:
-            print(f"Google search failed: {e}")
-            return []
+        elif self.search_engine == "serper" and self.serper_api_key:
+            return "serper", "POST", "https://google.serper.dev/search", {
+                "headers": {
+                    "X-API-KEY": self.serper_api_key,
+                    "Content-Type": "application/json"
+                },
+                "json": {
+                    "q": query,
+                    "num": max_results
+                },
+            }
+        elif self.search_engine == "google" and self.google_api_key and self.google_cse_id:
+            return "google", "GET", "https://www.googleapis.com/customsearch/v1", {
+                "params": {
+                    "key": self.google_api_key,
+                    "cx": self.google_cse_id,
+                    "q": query,
+                    "num": min(max_results, 10)
+                },
+            }
+        return None
+    
+    def _parse_results(self, engine: str, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Normalize a search API response into title/snippet/url/source dicts."""
+        results_key, snippet_key, url_key = _RESULT_FIELDS[engine]
+        return [
+            {
+                "title": result.get("title", ""),
+                "snippet": result.get(snippet_key, ""),
+                "url": result.get(url_key, ""),
+                "source": engine
+            }
+            for result in payload.get(results_key, [])
+        ]
     
     def _search_duckduckgo(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        """Search using DuckDuckGo (simple fallback)."""
+        """Search using DuckDuckGo's HTML endpoint (no API key needed).
+        
+        Returns an empty list when the page cannot be fetched or parsed, or
+        when selectolax is not installed.
+        """
         try:
-            # This is a basic implementation - in production you might want to use
-            # a proper DuckDuckGo search library or API
-            url = f"https://duckduckgo.com/html/?q={quote_plus(query)}"
-            
-            # For demo purposes, return a simple response
-            # In real implementation, you'd parse the HTML response
-            return [
-                {
-                    "title": f"Search results for: {query}",
-                    "snippet": "DuckDuckGo search result (fallback mode)",
-                    "url": url,
-                    "source": "duckduckgo"
-                }
-            ]
+            response = self._session.get(
+                _duckduckgo_url(query), headers=_DUCKDUCKGO_HEADERS, timeout=30
+            )
+            response.raise_for_status()
+            return _parse_duckduckgo_html(response.text, max_results)
         except Exception as e:
-            print(f"DuckDuckGo search failed: {e}")
+            logger.error("DuckDuckGo search failed: %s", e)
             return []
     
     def format_search_results(self, results: List[Dict[str, Any]]) -> str:
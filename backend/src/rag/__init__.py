@@ -2,9 +2,21 @@
 
 from .retriever import Retriever, Resource, Document, Chunk
 from .ragflow import RAGFlowProvider
-from .builder import build_retriever, get_available_providers, is_rag_enabled
+from .builder import (
+    build_retriever,
+    get_available_providers,
+    is_rag_enabled,
+    invalidate_rag_enabled_cache,
+    invalidate_retriever_cache,
+)
 from .config import rag_config, RAGProvider, RAGConfig
-from .tools import RAGSearchTool, create_rag_tool, get_rag_tool_info
+from .tools import (
+    RAGSearchTool,
+    RAGSearchResult,
+    create_rag_tool,
+    get_rag_tool_info,
+    invalidate_rag_tool_cache,
+)
 
 __all__ = [
     # Base classes
@@ -20,6 +32,8 @@ __all__ = [
     "build_retriever",
     "get_available_providers",
     "is_rag_enabled",
+    "invalidate_rag_enabled_cache",
+    "invalidate_retriever_cache",
     
     # Configuration
     "rag_config",
@@ -28,6 +42,8 @@ __all__ = [
     
     # Tools
     "RAGSearchTool",
+    "RAGSearchResult",
     "create_rag_tool",
     "get_rag_tool_info",
+    "invalidate_rag_tool_cache",
 ] 
\ No newline at end of file
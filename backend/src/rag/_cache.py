@@ -0,0 +1,62 @@
+"""Small in-process caches shared by the RAG and agent modules."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_NO_EXPIRY = float("inf")
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe LRU cache with an optional per-entry time-to-live."""
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the least recently used
+            ttl: Default time-to-live in seconds, None to keep entries until evicted
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store value under key, overriding the default TTL when ttl is given."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = _NO_EXPIRY if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
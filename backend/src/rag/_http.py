@@ -0,0 +1,38 @@
+"""Pooled HTTP sessions shared by the RAG and agent modules."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """Create a requests session with keep-alive pooling and retries on gateway errors.
+    
+    Args:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Maximum connections kept alive per host
+        
+    Returns:
+        Session whose HTTP(S) adapters retry 502/503/504 up to three times
+    """
+    # Only gateway status codes are retried: connect errors, read errors and
+    # timeouts surface immediately so a dead host costs one timeout, not four
+    retry = Retry(
+        total=None,
+        connect=0,
+        read=0,
+        other=0,
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        # Retrieval and search POSTs are reads, so they are safe to retry
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
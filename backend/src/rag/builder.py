@@ -1,5 +1,6 @@
 """Builder function for RAG retrieval providers."""
 
+import functools
 import logging
 from typing import Optional
 
@@ -10,9 +11,14 @@ from .ragflow import RAGFlowProvider
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def build_retriever() -> Optional[Retriever]:
     """Build and return a retriever instance based on environment configuration.
     
+    The retriever is built once per process and shared, so its HTTP session
+    and cached resource listings survive across tools and requests. Call
+    invalidate_retriever_cache() after changing rag_config.
+    
     Returns:
         A retriever instance if configured, None otherwise
     """
@@ -49,11 +55,29 @@ def build_retriever() -> Optional[Retriever]:
         return None
 
 
+_AVAILABLE_PROVIDERS = tuple(provider.value for provider in RAGProvider)
+
+
 def get_available_providers() -> list[str]:
     """Get list of available RAG providers."""
-    return [provider.value for provider in RAGProvider]
+    return list(_AVAILABLE_PROVIDERS)
 
 
+@functools.cache
 def is_rag_enabled() -> bool:
-    """Check if RAG is enabled and properly configured."""
-    return rag_config.enabled and rag_config.validate() 
\ No newline at end of file
+    """Check if RAG is enabled and properly configured.
+    
+    The result is computed once per process; call invalidate_rag_enabled_cache()
+    after changing rag_config.
+    """
+    return rag_config.enabled and rag_config.validate()
+
+
+def invalidate_rag_enabled_cache() -> None:
+    """Forget the cached is_rag_enabled() result."""
+    is_rag_enabled.cache_clear()
+
+
+def invalidate_retriever_cache() -> None:
+    """Forget the shared retriever so the next build_retriever() call rebuilds it."""
+    build_retriever.cache_clear() 
\ No newline at end of file
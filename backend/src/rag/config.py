@@ -1,19 +1,25 @@
 """RAG provider configuration module."""
 
+import logging
 import os
 import enum
 from typing import Optional
 from dotenv import load_dotenv, find_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables from .env file
-# Try to find .env file in current directory or parent directories
-env_file = find_dotenv()
-if env_file:
-    load_dotenv(env_file)
-    print(f"DEBUG: Loaded environment from {env_file}")
-else:
-    load_dotenv()
-    print("DEBUG: No .env file found, using system environment variables")
+# Try to find .env file in current directory or parent directories. Child
+# processes inherit both the loaded variables and the flag, so the filesystem
+# walk runs once per process tree rather than on every worker import.
+if os.environ.get("_DOTENV_LOADED") != "1":
+    env_file = find_dotenv()
+    if env_file:
+        load_dotenv(env_file)
+        logger.debug("Loaded environment from %s", env_file)
+    else:
+        logger.debug("No .env file found, using system environment variables")
+    os.environ["_DOTENV_LOADED"] = "1"
 
 
 class RAGProvider(enum.Enum):
@@ -38,7 +44,10 @@ class RAGConfig:
         # Common configurations
         self.max_documents = int(os.getenv("RAG_MAX_DOCUMENTS", "5"))
         self.similarity_threshold = float(os.getenv("RAG_SIMILARITY_THRESHOLD", "0.1"))
+        # Results whose best chunk scores below this fraction of the threshold count as a miss
+        self.similarity_miss_ratio = float(os.getenv("RAG_SIMILARITY_MISS_RATIO", "0.5"))
         self.enable_fallback = os.getenv("RAG_ENABLE_FALLBACK", "true").lower() == "true"
+        self.query_cache_ttl = float(os.getenv("RAG_QUERY_CACHE_TTL", "600"))
         
     def validate(self) -> bool:
         """Validate current configuration."""
@@ -1,23 +1,36 @@
 """RAGFlow integration for RAG retrieval."""
 
-import os
+import logging
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import httpx
+import orjson
 import requests
-from typing import List, Optional, Tuple
-from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional, Tuple
 
+from ._cache import LRUCache
+from ._http import build_session
+from .config import rag_config
 from .retriever import Retriever, Resource, Document, Chunk
 
+logger = logging.getLogger(__name__)
+
+# Dataset listings change rarely; keep them for five minutes per name filter
+_RESOURCE_LIST_TTL = 300
+
 
 class RAGFlowProvider(Retriever):
     """RAGFlow provider for document retrieval and resource management."""
     
     def __init__(self):
         """Initialize RAGFlow provider with API credentials."""
-        print(f"DEBUG: Initializing RAGFlowProvider")
+        logger.debug("Initializing RAGFlowProvider")
         # Remove os.getcwd() call to avoid blocking in ASGI environment
         
-        self.api_url = os.getenv("RAGFLOW_API_URL")
-        print(f"DEBUG: RAGFLOW_API_URL from env: {self.api_url}")
+        self.api_url = rag_config.ragflow_api_url
+        logger.debug("RAGFLOW_API_URL from config: %s", self.api_url)
         
         if not self.api_url:
             raise ValueError("RAGFLOW_API_URL environment variable is not set")
@@ -25,29 +38,60 @@ class RAGFlowProvider(Retriever):
         # Handle common URL configuration issues
         if self.api_url == "http://localhost":
             self.api_url = "http://localhost:9380"
-            print("Warning: RAGFLOW_API_URL was missing port, using default :9380")
+            logger.warning("RAGFLOW_API_URL was missing port, using default :9380")
         
         # Remove trailing slash
         self.api_url = self.api_url.rstrip('/')
-        print(f"DEBUG: Final API URL: {self.api_url}")
+        logger.debug("Final API URL: %s", self.api_url)
         
-        self.api_key = os.getenv("RAGFLOW_API_KEY")
+        self.api_key = rag_config.ragflow_api_key
         if not self.api_key:
             raise ValueError("RAGFLOW_API_KEY environment variable is not set")
         
-        print(f"DEBUG: RAGFLOW_API_KEY: {'Set' if self.api_key else 'Not set'}")
+        self.page_size = rag_config.ragflow_page_size
+        
+        # Static request headers, sent by both the pooled session and the async client
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
         
-        self.page_size = int(os.getenv("RAGFLOW_RETRIEVAL_SIZE", "10"))
+        # Pooled connections reuse TCP/TLS across retrieval calls
+        self._session = build_session()
+        self._session.headers.update(self._headers)
+        
+        # list_resources results keyed by the optional name filter
+        self._resource_cache: LRUCache[List[Resource]] = LRUCache(maxsize=8, ttl=_RESOURCE_LIST_TTL)
     
     def query_relevant_documents(
-        self, query: str, resources: List[Resource] = []
+        self, query: str, resources: List[Resource] = [], top_k: Optional[int] = None
     ) -> List[Document]:
         """Query relevant documents from RAGFlow."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        payload = self._build_retrieval_payload(query, resources)
+        
+        response = self._session.post(
+            f"{self.api_url}/api/v1/retrieval",
+            json=payload
+        )
+        return self._parse_retrieval_response(response, top_k)
+    
+    async def aquery_relevant_documents(
+        self, query: str, resources: List[Resource] = [], top_k: Optional[int] = None
+    ) -> List[Document]:
+        """Query relevant documents from RAGFlow without blocking the event loop."""
+        payload = self._build_retrieval_payload(query, resources)
         
+        # A client per call: the provider is a process-wide singleton, and an
+        # AsyncClient cannot be shared across event loops
+        async with httpx.AsyncClient(headers=self._headers, timeout=30) as client:
+            response = await client.post(
+                f"{self.api_url}/api/v1/retrieval",
+                json=payload
+            )
+        return self._parse_retrieval_response(response, top_k)
+    
+    def _build_retrieval_payload(self, query: str, resources: List[Resource]) -> Dict[str, Any]:
+        """Build the JSON payload for a retrieval request."""
         dataset_ids = []
         document_ids = []
         
@@ -65,80 +109,86 @@ class RAGFlowProvider(Retriever):
             "page_size": self.page_size,
         }
         
-        print(f"DEBUG: RAG tool API call")
-        print(f"DEBUG: URL: {self.api_url}/api/v1/retrieval")
-        print(f"DEBUG: Headers: {headers}")
-        print(f"DEBUG: Payload: {payload}")
+        logger.debug("RAGFlow retrieval call to %s/api/v1/retrieval with payload %s", self.api_url, payload)
         
-        response = requests.post(
-            f"{self.api_url}/api/v1/retrieval",
-            headers=headers,
-            json=payload
-        )
-        
-        print(f"DEBUG: Response status: {response.status_code}")
-        print(f"DEBUG: Response text: {response.text[:500]}...")
+        return payload
+    
+    def _parse_retrieval_response(self, response: Any, top_k: Optional[int] = None) -> List[Document]:
+        """Turn a requests/httpx retrieval response into at most top_k documents."""
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Response status: %s", response.status_code)
+            # Decode only the logged prefix rather than the whole body
+            logger.debug("Response text: %s...", response.content[:500].decode("utf-8", "replace"))
         
         if response.status_code != 200:
             raise Exception(f"Failed to query documents: {response.text}")
         
-        result = response.json()
+        result = orjson.loads(response.content)
         data = result.get("data", {})
         
-        print(f"DEBUG: RAGFlow response data keys: {list(data.keys())}")
-        print(f"DEBUG: Number of doc_aggs: {len(data.get('doc_aggs', []))}")
-        print(f"DEBUG: Number of chunks: {len(data.get('chunks', []))}")
-        
-        # Create documents from aggregated results
-        docs = {}
-        for doc_agg in data.get("doc_aggs", []):
-            doc_id = doc_agg.get("doc_id")
-            doc_name = doc_agg.get("doc_name", "")
-            print(f"DEBUG: Creating document {doc_id}: {doc_name}")
-            docs[doc_id] = Document(
-                id=doc_id,
-                title=doc_name,
-                chunks=[]
-            )
+        if debug:
+            logger.debug("RAGFlow response data keys: %s", list(data.keys()))
+            logger.debug("Number of doc_aggs: %d", len(data.get('doc_aggs', [])))
+            logger.debug("Number of chunks: %d", len(data.get('chunks', [])))
         
-        # Add chunks to documents
-        for i, chunk in enumerate(data.get("chunks", [])):
-            doc_id = chunk.get("document_id")
-            content = chunk.get("content", "")
-            similarity = chunk.get("similarity", 0.0)
-            print(f"DEBUG: Chunk {i}: doc_id={doc_id}, similarity={similarity}, content_length={len(content)}")
-            
-            if doc_id in docs:
-                docs[doc_id].chunks.append(
-                    Chunk(
-                        content=content,
-                        similarity=similarity
-                    )
+        # Group chunks by document in one pass
+        chunks_by_doc = defaultdict(list)
+        for chunk in data.get("chunks", []):
+            chunks_by_doc[chunk.get("document_id")].append(
+                Chunk(
+                    content=chunk.get("content", ""),
+                    similarity=chunk.get("similarity", 0.0)
                 )
-            else:
-                print(f"DEBUG: Warning - chunk {i} references unknown document {doc_id}")
+            )
+        
+        doc_aggs = data.get("doc_aggs", [])
+        orphans = chunks_by_doc.keys() - {doc_agg.get("doc_id") for doc_agg in doc_aggs}
         
-        print(f"DEBUG: Final documents: {len(docs)}")
-        for doc_id, doc in docs.items():
-            print(f"DEBUG: Document {doc_id}: {doc.title} with {len(doc.chunks)} chunks")
+        # Create documents from aggregated results, each with its full chunk list;
+        # doc_aggs is ranked, so only the first top_k need building
+        docs = {
+            doc_agg.get("doc_id"): Document(
+                id=doc_agg.get("doc_id"),
+                title=doc_agg.get("doc_name", ""),
+                chunks=chunks_by_doc.get(doc_agg.get("doc_id"), [])
+            )
+            for doc_agg in doc_aggs[:top_k]
+        }
+        
+        if orphans:
+            logger.warning("Chunks reference unknown documents: %s", sorted(map(str, orphans)))
+        
+        if debug:
+            logger.debug("Final documents: %d", len(docs))
+            for doc_id, doc in docs.items():
+                logger.debug("Document %s: %s with %d chunks", doc_id, doc.title, len(doc.chunks))
         
         return list(docs.values())
     
     def list_resources(self, query: Optional[str] = None) -> List[Resource]:
-        """List available datasets from RAGFlow."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        
+        """List available datasets from RAGFlow, served from cache when fresh."""
+        resources = self._resource_cache.get(query)
+        if resources is None:
+            resources = self._fetch_resources(query)
+            if resources is None:
+                return self._test_resources()
+            self._resource_cache.set(query, resources)
+        return list(resources)
+    
+    def refresh_resources(self) -> None:
+        """Forget cached dataset listings so the next call refetches them."""
+        self._resource_cache.clear()
+    
+    def _fetch_resources(self, query: Optional[str]) -> Optional[List[Resource]]:
+        """Fetch datasets from RAGFlow, or None when the server is unreachable."""
         params = {}
         if query:
             params["name"] = query
         
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.api_url}/api/v1/datasets",
-                headers=headers,
                 params=params,
                 timeout=5
             )
@@ -146,7 +196,7 @@ class RAGFlowProvider(Retriever):
             if response.status_code != 200:
                 raise Exception(f"Failed to list resources: {response.text}")
             
-            result = response.json()
+            result = orjson.loads(response.content)
             resources = []
             
             for item in result.get("data", []):
@@ -160,64 +210,62 @@ class RAGFlowProvider(Retriever):
             return resources
         
         except requests.exceptions.ConnectionError:
-            print(f"RAGFlow connection failed: Cannot connect to {self.api_url}")
-            print("Please check:")
-            print("1. RAGFlow server is running")
-            print("2. RAGFLOW_API_URL is correct (usually http://localhost:9380)")
-            print("3. No firewall blocking the connection")
-            print("Returning test data for development.")
-            return [
-                Resource(
-                    uri="rag://dataset/test-1",
-                    title="测试知识库1",
-                    description="这是一个测试知识库，包含技术文档"
-                ),
-                Resource(
-                    uri="rag://dataset/test-2", 
-                    title="测试知识库2",
-                    description="这是另一个测试知识库，包含FAQ文档"
-                )
-            ]
+            logger.warning(
+                "RAGFlow connection failed: Cannot connect to %s. Please check that the "
+                "RAGFlow server is running, RAGFLOW_API_URL is correct (usually "
+                "http://localhost:9380) and no firewall blocks the connection. "
+                "Returning test data for development.",
+                self.api_url,
+            )
+            return None
         except Exception as e:
-            print(f"RAGFlow error: {e}")
-            print("Returning test data for development.")
-            return [
-                Resource(
-                    uri="rag://dataset/test-1",
-                    title="测试知识库1",
-                    description="这是一个测试知识库，包含技术文档"
-                ),
-                Resource(
-                    uri="rag://dataset/test-2", 
-                    title="测试知识库2",
-                    description="这是另一个测试知识库，包含FAQ文档"
-                )
-            ]
+            logger.warning("RAGFlow error: %s. Returning test data for development.", e)
+            return None
+    
+    @staticmethod
+    def _test_resources() -> List[Resource]:
+        """Placeholder datasets returned when RAGFlow cannot be reached."""
+        return [
+            Resource(
+                uri="rag://dataset/test-1",
+                title="测试知识库1",
+                description="这是一个测试知识库，包含技术文档"
+            ),
+            Resource(
+                uri="rag://dataset/test-2", 
+                title="测试知识库2",
+                description="这是另一个测试知识库，包含FAQ文档"
+            )
+        ]
     
     def _parse_uri(self, uri: str) -> Tuple[str, str]:
         """Parse a RAG URI to extract dataset and document IDs."""
-        print(f"DEBUG: Parsing URI: {uri}")
-        parsed = urlparse(uri)
-        print(f"DEBUG: Parsed URI - scheme: {parsed.scheme}, netloc: {parsed.netloc}, path: {parsed.path}, fragment: {parsed.fragment}")
-        
-        if parsed.scheme != "rag":
-            raise ValueError(f"Invalid URI scheme: {uri}")
-        
-        # For URI like rag://dataset/ID, netloc is "dataset" and path is "/ID"
-        if parsed.netloc == "dataset":
-            # Extract dataset ID from path
-            dataset_id = parsed.path.strip("/")
+        return _parse_uri(uri)
+
+
+# rag:[//<netloc>]<path>[?<query>][#<document_id>], split the way urlparse splits
+# it: the scheme is case-insensitive and the query is never part of an ID
+_RAG_URI_RE = re.compile(r"rag:(?://([^/?#]*))?([^?#]*)(?:\?[^#]*)?(?:#(.*))?", re.IGNORECASE | re.DOTALL)
+
+
+@lru_cache(maxsize=1024)
+def _parse_uri(uri: str) -> Tuple[str, str]:
+    """Parse a RAG URI to extract dataset and document IDs (cached per URI)."""
+    match = _RAG_URI_RE.fullmatch(uri)
+    if not match:
+        raise ValueError(f"Invalid URI scheme: {uri}")
+    netloc, path, fragment = match.groups(default="")
+    
+    # For URI like rag://dataset/ID, netloc is "dataset" and the whole path is the ID
+    if netloc == "dataset":
+        dataset_id = path.strip("/")
+    else:
+        # Fallback: rag:///dataset/ID or rag://host/dataset/ID
+        path_parts = path.strip("/").split("/")
+        if len(path_parts) >= 2 and path_parts[0] == "dataset":
+            dataset_id = path_parts[1]
         else:
-            # Fallback: try to extract from path parts
-            path_parts = parsed.path.strip("/").split("/")
-            print(f"DEBUG: Path parts: {path_parts}")
-            if len(path_parts) >= 2 and path_parts[0] == "dataset":
-                dataset_id = path_parts[1]
-            else:
-                dataset_id = ""
-        
-        # Extract document ID from fragment
-        document_id = parsed.fragment if parsed.fragment else ""
-        
-        print(f"DEBUG: Extracted dataset_id: '{dataset_id}', document_id: '{document_id}'")
-        return dataset_id, document_id 
\ No newline at end of file
+            dataset_id = ""
+    
+    logger.debug("Parsed URI %s - dataset_id: '%s', document_id: '%s'", uri, dataset_id, fragment)
+    return dataset_id, fragment
@@ -1,6 +1,8 @@
 """Base classes and interfaces for RAG retrieval system."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import List, Optional
 from pydantic import BaseModel
 
@@ -12,17 +14,19 @@ class Resource(BaseModel):
     description: str = ""
 
 
-class Chunk(BaseModel):
+@dataclass(slots=True)
+class Chunk:
     """Represents a chunk of text from a document."""
     content: str
     similarity: float = 0.0
 
 
-class Document(BaseModel):
+@dataclass(slots=True)
+class Document:
     """Represents a document with its chunks."""
     id: str
     title: str
-    chunks: List[Chunk] = []
+    chunks: List[Chunk] = field(default_factory=list)
 
 
 class Retriever(ABC):
@@ -30,19 +34,38 @@ class Retriever(ABC):
     
     @abstractmethod
     def query_relevant_documents(
-        self, query: str, resources: List[Resource] = []
+        self, query: str, resources: List[Resource] = [], top_k: Optional[int] = None
     ) -> List[Document]:
         """Query relevant documents based on the query and optional resources.
         
         Args:
             query: The search query
             resources: Optional list of resources to search within
+            top_k: Maximum number of documents to return, or None for no limit
             
         Returns:
             List of relevant documents with their chunks
         """
         pass
     
+    async def aquery_relevant_documents(
+        self, query: str, resources: List[Resource] = [], top_k: Optional[int] = None
+    ) -> List[Document]:
+        """Async variant of query_relevant_documents.
+        
+        The default runs the sync query in a worker thread; providers with an
+        async HTTP client should override it.
+        
+        Args:
+            query: The search query
+            resources: Optional list of resources to search within
+            top_k: Maximum number of documents to return, or None for no limit
+            
+        Returns:
+            List of relevant documents with their chunks
+        """
+        return await asyncio.to_thread(self.query_relevant_documents, query, resources, top_k)
+    
     @abstractmethod
     def list_resources(self, query: Optional[str] = None) -> List[Resource]:
         """List available resources from the RAG provider.
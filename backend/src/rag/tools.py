@@ -1,7 +1,7 @@
 """RAG tool integration for LangChain agents."""
 
 import logging
-from typing import List, Optional, Type, Any, Dict
+from typing import Iterator, List, Literal, NamedTuple, Optional, Type, Any, Dict
 from langchain_core.tools import BaseTool
 from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
@@ -9,6 +9,8 @@ from langchain_core.callbacks import (
 )
 from pydantic import BaseModel, Field
 
+from ._cache import LRUCache
+
 from .builder import build_retriever, is_rag_enabled
 from .retriever import Retriever, Resource, Document
 from .config import rag_config
@@ -25,6 +27,12 @@ class RAGSearchInput(BaseModel):
     )
 
 
+class RAGSearchResult(NamedTuple):
+    """Outcome of a RAG search: a status tag plus the formatted text."""
+    status: Literal["ok", "empty", "error"]
+    content: str
+
+
 class RAGSearchTool(BaseTool):
     """RAG search tool for retrieving information from knowledge base."""
     
@@ -47,6 +55,78 @@ class RAGSearchTool(BaseTool):
         if not self.retriever:
             logger.warning("RAG retriever not available, tool will return empty results")
     
+    def search(self, query: str, max_results: Optional[int] = None) -> RAGSearchResult:
+        """Search the knowledge base and tag the result with its status.
+        
+        Args:
+            query: Search query
+            max_results: Maximum number of documents to return
+            
+        Returns:
+            RAGSearchResult whose content is the formatted documents for "ok"
+            and a human-readable message for "empty" and "error"
+        """
+        if not self.retriever:
+            return RAGSearchResult(
+                "empty", "RAG is not configured or not available. Please check your configuration."
+            )
+        
+        try:
+            logger.info("RAG search query: %s", query)
+            logger.debug("Available resources: %d", len(self.resources))
+            documents = self.retriever.query_relevant_documents(
+                query, self.resources, top_k=max_results or rag_config.max_documents
+            )
+            return self._build_result(documents)
+        except Exception as e:
+            logger.error("Error during RAG search: %s", e)
+            return RAGSearchResult("error", f"Error occurred during knowledge base search: {str(e)}")
+    
+    async def asearch(self, query: str, max_results: Optional[int] = None) -> RAGSearchResult:
+        """Async variant of search that awaits the retriever instead of blocking.
+        
+        Args:
+            query: Search query
+            max_results: Maximum number of documents to return
+            
+        Returns:
+            RAGSearchResult, as for search
+        """
+        if not self.retriever:
+            return RAGSearchResult(
+                "empty", "RAG is not configured or not available. Please check your configuration."
+            )
+        
+        try:
+            logger.info("RAG search query: %s", query)
+            logger.debug("Available resources: %d", len(self.resources))
+            documents = await self.retriever.aquery_relevant_documents(
+                query, self.resources, top_k=max_results or rag_config.max_documents
+            )
+            return self._build_result(documents)
+        except Exception as e:
+            logger.error("Error during RAG search: %s", e)
+            return RAGSearchResult("error", f"Error occurred during knowledge base search: {str(e)}")
+    
+    def _build_result(self, documents: List[Document]) -> RAGSearchResult:
+        """Format retrieved documents into a search result."""
+        if not documents:
+            return RAGSearchResult("empty", "No relevant information found in the knowledge base.")
+        
+        # When nothing comes close to the threshold, every document would only
+        # contribute fallback chunks; report a miss instead of formatting them
+        best = max((chunk.similarity for doc in documents for chunk in doc.chunks), default=0.0)
+        if best < rag_config.similarity_threshold * rag_config.similarity_miss_ratio:
+            logger.info("RAG search best similarity %.3f is too far below threshold", best)
+            return RAGSearchResult(
+                "empty", f"No sufficiently relevant information found (best similarity={best:.2f})."
+            )
+        
+        result = _format_documents(documents)
+        logger.info("RAG search returned %d documents", len(documents))
+        
+        return RAGSearchResult("ok", result)
+    
     def _run(
         self,
         query: str,
@@ -54,60 +134,7 @@ class RAGSearchTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
         """Execute RAG search synchronously."""
-        if not self.retriever:
-            return "RAG is not configured or not available. Please check your configuration."
-        
-        try:
-            logger.info(f"RAG search query: {query}")
-            logger.debug(f"Available resources: {len(self.resources)}")
-            
-            # Use configured max_results or global config
-            max_docs = max_results or rag_config.max_documents
-            
-            documents = self.retriever.query_relevant_documents(query, self.resources)
-            
-            if not documents:
-                return "No relevant information found in the knowledge base."
-            
-            # Limit results
-            documents = documents[:max_docs]
-            
-            # Format results
-            formatted_results = []
-            for i, doc in enumerate(documents, 1):
-                doc_text = f"## Document {i}: {doc.title}\n\n"
-                
-                # Log chunk similarities for debugging
-                if doc.chunks:
-                    similarities = [chunk.similarity for chunk in doc.chunks]
-                    logger.info(f"Document {i} chunk similarities: {similarities}")
-                    logger.info(f"Similarity threshold: {rag_config.similarity_threshold}")
-                
-                # Filter chunks by similarity threshold
-                relevant_chunks = [
-                    chunk for chunk in doc.chunks 
-                    if chunk.similarity >= rag_config.similarity_threshold
-                ]
-                
-                if not relevant_chunks:
-                    # If no chunks meet threshold, take the best chunks anyway
-                    logger.warning(f"No chunks meet similarity threshold {rag_config.similarity_threshold}, using all chunks")
-                    relevant_chunks = doc.chunks[:3]  # Take top 3 chunks
-                
-                for chunk in relevant_chunks:
-                    doc_text += f"**Content:** {chunk.content}\n"
-                    doc_text += f"**Similarity:** {chunk.similarity:.3f}\n\n"
-                
-                formatted_results.append(doc_text)
-            
-            result = "\n".join(formatted_results)
-            logger.info(f"RAG search returned {len(documents)} documents")
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error during RAG search: {e}")
-            return f"Error occurred during knowledge base search: {str(e)}"
+        return self.search(query, max_results).content
     
     async def _arun(
         self,
@@ -116,13 +143,56 @@ class RAGSearchTool(BaseTool):
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Execute RAG search asynchronously."""
-        # For now, just call the synchronous version
-        return self._run(query, max_results, run_manager.get_sync() if run_manager else None)
+        return (await self.asearch(query, max_results)).content
+
+
+# Markdown templates for formatted search results, parsed once at import
+_DOCUMENT_HEADER = "## Document {}: {}\n\n".format
+_CHUNK_TEMPLATE = "**Content:** {}\n**Similarity:** {:.3f}\n\n".format
+
+
+def _format_documents(documents: List[Document]) -> str:
+    """Format documents and their relevant chunks as markdown for the LLM."""
+    return "\n".join(_iter_formatted_documents(documents))
+
+
+def _iter_formatted_documents(documents: List[Document]) -> Iterator[str]:
+    """Yield the markdown block for each document as soon as it is formatted."""
+    threshold = rag_config.similarity_threshold
+    for i, doc in enumerate(documents, 1):
+        parts = [_DOCUMENT_HEADER(i, doc.title)]
+        
+        # Log chunk similarities for debugging, only when INFO is enabled
+        if doc.chunks and logger.isEnabledFor(logging.INFO):
+            similarities = [chunk.similarity for chunk in doc.chunks]
+            logger.info("Document %d chunk similarities: %s", i, similarities)
+            logger.info("Similarity threshold: %s", threshold)
+        
+        # Filter chunks by similarity threshold and format them in the same pass
+        for chunk in doc.chunks:
+            if chunk.similarity >= threshold:
+                parts.append(_CHUNK_TEMPLATE(chunk.content, chunk.similarity))
+        
+        if len(parts) == 1:
+            # If no chunks meet threshold, take the best chunks anyway
+            logger.warning("No chunks meet similarity threshold %s, using all chunks", threshold)
+            # Take top 3 chunks
+            parts.extend(_CHUNK_TEMPLATE(chunk.content, chunk.similarity) for chunk in doc.chunks[:3])
+        
+        yield "".join(parts)
+
+
+# RAG tools keyed by the sorted URIs of the resources they search
+_rag_tool_cache: LRUCache[RAGSearchTool] = LRUCache(maxsize=32)
 
 
 def create_rag_tool(resources: Optional[List[Resource]] = None) -> Optional[RAGSearchTool]:
     """Create a RAG search tool if RAG is enabled and configured.
     
+    Tools are cached per set of resource URIs, so repeated calls over the same
+    resources return the same instance; call invalidate_rag_tool_cache() after
+    changing rag_config.
+    
     Args:
         resources: List of resources to search within
         
@@ -132,13 +202,27 @@ def create_rag_tool(resources: Optional[List[Resource]] = None) -> Optional[RAGS
     if not is_rag_enabled():
         logger.info("RAG is not enabled, skipping RAG tool creation")
         return None
-        
+    
+    key = tuple(sorted(resource.uri for resource in resources or ()))
+    rag_tool = _rag_tool_cache.get(key)
+    if rag_tool is not None:
+        return rag_tool
+    
     try:
         logger.info("Creating RAG search tool")
-        return RAGSearchTool(resources=resources)
+        rag_tool = RAGSearchTool(resources=resources)
     except Exception as e:
-        logger.error(f"Failed to create RAG tool: {e}")
+        logger.error("Failed to create RAG tool: %s", e)
         return None
+    
+    # Only successful creations are cached, so a failure is retried next call
+    _rag_tool_cache.set(key, rag_tool)
+    return rag_tool
+
+
+def invalidate_rag_tool_cache() -> None:
+    """Forget cached RAG tools so the next create_rag_tool() call builds a new one."""
+    _rag_tool_cache.clear()
 
 
 def get_rag_tool_info() -> Dict[str, Any]:
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Start the LangGraph server with proper configuration for RAGFlow."""
 
-import subprocess
 import sys
 import os
 
@@ -27,15 +26,12 @@ def start_server():
     
     print(f"Running command: {' '.join(cmd)}")
     print("=" * 50)
+    # Buffered output would be lost when exec replaces this process
+    sys.stdout.flush()
     
     try:
-        # Start the server
-        subprocess.run(cmd, check=True)
-    except KeyboardInterrupt:
-        print("\n👋 Server stopped by user")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error starting server: {e}")
-        sys.exit(1)
+        # Replace this process with the server instead of waiting on a child
+        os.execvp(cmd[0], cmd)
     except FileNotFoundError:
         print("❌ LangGraph CLI not found. Please install it:")
         print("pip install langgraph-cli")
@@ -20,7 +20,7 @@ def test_complete_workflow():
     print("🔍 Testing Complete RAG + Web Search Workflow")
     print("=" * 60)
     
-    from agent.graph import research_graph
+    from agent.graph import get_research_graph
     from langchain_core.messages import HumanMessage
     
     # Test configuration
@@ -44,7 +44,7 @@ def test_complete_workflow():
     
     try:
         # Run the workflow
-        result = research_graph.invoke(initial_state)
+        result = get_research_graph().invoke(initial_state)
         
         print("\n" + "=" * 60)
         print("✅ Workflow completed successfully!")
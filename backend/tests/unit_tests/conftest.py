@@ -0,0 +1,14 @@
+import os
+import sys
+
+# Backend modules import each other as top-level packages (rag, agent), and
+# some modules import the RAG package as src.rag
+_BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.insert(0, os.path.join(_BACKEND_DIR, "src"))
+sys.path.insert(0, _BACKEND_DIR)
+
+# Importing agent.logging_config configures logging; keep it off the filesystem
+os.environ.setdefault("LOG_FILE_ENABLED", "false")
+
+# graph.py refuses to import without an LLM API key; no request is ever sent
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
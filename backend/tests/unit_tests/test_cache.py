@@ -0,0 +1,108 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from rag import _cache as cache_module
+from rag._cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_entries_expire_after_default_ttl(clock):
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    clock.value += 9.9
+    assert cache.get("a") == 1
+    clock.value += 0.2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = LRUCache(maxsize=4, ttl=100)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+    clock.value += 2
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_no_ttl_keeps_entries_until_evicted(clock):
+    cache = LRUCache(maxsize=4)
+    cache.set("a", 1)
+    clock.value += 10**9
+    assert cache.get("a") == 1
+
+
+def test_get_returns_default_for_missing_key():
+    cache = LRUCache(maxsize=2)
+    assert cache.get("missing") is None
+    assert cache.get("missing", "fallback") == "fallback"
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_overwriting_refreshes_recency():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_pop_and_clear():
+    cache = LRUCache(maxsize=4)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_concurrent_access_keeps_cache_consistent():
+    cache = LRUCache(maxsize=50)
+    errors = []
+    start = threading.Barrier(8)
+
+    def worker(offset):
+        try:
+            start.wait()
+            for i in range(2000):
+                key = (offset + i) % 120
+                cache.set(key, key)
+                value = cache.get(key)
+                assert value is None or value == key
+                if i % 7 == 0:
+                    cache.pop(key)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n * 13,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(cache) <= 50
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agent import graph
+
+
+@pytest.fixture
+def llm_reply(monkeypatch):
+    """Make every LLM created by the graph answer with the given text."""
+    reply = SimpleNamespace(content="")
+    llm = SimpleNamespace(invoke=lambda prompt: SimpleNamespace(content=reply.content))
+    monkeypatch.setattr(graph.LLMFactory, "create_llm", staticmethod(lambda **kwargs: llm))
+    return reply
+
+
+def _generate(count=5):
+    state = {"messages": [], "initial_search_query_count": count}
+    return graph.generate_query(state, {"configurable": {}})["search_query"]
+
+
+def test_generate_query_reads_fenced_json(llm_reply):
+    llm_reply.content = 'Here you go:\n```json\n{"query": ["first", "second"]}\n```'
+    assert _generate() == ["first", "second"]
+
+
+def test_generate_query_reads_bare_json(llm_reply):
+    llm_reply.content = '  {"query": "only one", "rationale": "r"}'
+    assert _generate() == ["only one"]
+
+
+def test_generate_query_falls_back_to_plain_lines(llm_reply):
+    llm_reply.content = "# Queries\n1. alpha\n- beta\n{broken"
+    assert _generate() == ["alpha", "beta"]
+
+
+def test_generate_query_caps_query_count(llm_reply):
+    llm_reply.content = '{"query": ["a", "b", "c"]}'
+    assert _generate(count=2) == ["a", "b"]
+
+
+def test_generate_query_drops_duplicates_keeping_first_spelling(llm_reply):
+    llm_reply.content = '{"query": ["Solar Power", "wind", " solar power ", "WIND", "tides"]}'
+    assert _generate() == ["Solar Power", "wind", "tides"]
@@ -0,0 +1,27 @@
+import pytest
+
+from agent import llm_factory
+from agent.llm_factory import LLMFactory
+
+
+@pytest.fixture(autouse=True)
+def empty_pool(monkeypatch):
+    monkeypatch.setattr(llm_factory, "_LLM_POOL", {})
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+
+def test_same_arguments_reuse_one_client():
+    llm = LLMFactory.create_llm("gpt-4o-mini", temperature=0, max_retries=2)
+
+    assert LLMFactory.create_llm("gpt-4o-mini", temperature=0, max_retries=2) is llm
+    assert LLMFactory.create_llm("gpt-4o-mini", temperature=1.0, max_retries=2) is not llm
+
+
+def test_extra_kwargs_bypass_the_pool():
+    pooled = LLMFactory.create_llm("gpt-4o-mini", temperature=0)
+
+    custom = LLMFactory.create_llm("gpt-4o-mini", temperature=0, timeout=5)
+
+    assert custom is not pooled
+    assert LLMFactory.create_llm("gpt-4o-mini", temperature=0, timeout=5) is not custom
+    assert list(llm_factory._LLM_POOL) == [("gpt-4o-mini", 0, 2)]
@@ -0,0 +1,128 @@
+import gc
+import logging
+import os
+
+import pytest
+
+from agent.logging_config import CachedTimeFormatter, RawBytesFileHandler, setup_logging
+
+
+def _fd_is_open(fd):
+    try:
+        os.fstat(fd)
+    except OSError:
+        return False
+    return True
+
+
+def _record(created, msg="message"):
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, None, None)
+    record.created = created
+    record.msecs = (created - int(created)) * 1000
+    return record
+
+
+@pytest.fixture
+def isolated_root_logger():
+    """Give setup_logging an empty root logger and restore pytest's handlers afterwards."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers = []
+    yield root
+    for handler in root.handlers:
+        handler.close()
+    root.handlers = saved_handlers
+    root.setLevel(saved_level)
+
+
+def test_raw_handler_appends_one_line_per_record(tmp_path):
+    path = tmp_path / "app.log"
+    handler = RawBytesFileHandler(str(path))
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    handler.emit(_record(0, "first"))
+    handler.emit(_record(0, "second ✓"))
+    handler.close()
+    assert path.read_text(encoding="utf-8") == "INFO first\nINFO second ✓\n"
+
+
+def test_raw_handler_appends_to_existing_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("existing\n", encoding="utf-8")
+    handler = RawBytesFileHandler(str(path))
+    handler.emit(_record(0, "new"))
+    handler.close()
+    assert path.read_text(encoding="utf-8") == "existing\nnew\n"
+
+
+def test_raw_handler_close_releases_fd_and_ignores_later_records(tmp_path):
+    path = tmp_path / "app.log"
+    handler = RawBytesFileHandler(str(path))
+    fd = handler._fd
+    handler.close()
+    assert not _fd_is_open(fd)
+    handler.emit(_record(0, "dropped"))
+    # A second close must not close an unrelated descriptor reusing the number
+    handler.close()
+    assert path.read_text(encoding="utf-8") == ""
+
+
+def test_raw_handler_fd_closed_on_garbage_collection(tmp_path):
+    handler = RawBytesFileHandler(str(tmp_path / "app.log"))
+    fd = handler._fd
+    del handler
+    gc.collect()
+    assert not _fd_is_open(fd)
+
+
+def test_setup_logging_closes_replaced_handlers(tmp_path, isolated_root_logger, monkeypatch):
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    log_file = str(tmp_path / "logs" / "app.log")
+
+    setup_logging(log_file=log_file, enable_console=False)
+    (first,) = isolated_root_logger.handlers
+
+    setup_logging(log_file=log_file, enable_console=False)
+    (second,) = isolated_root_logger.handlers
+
+    # The new handler may reuse the same fd number, so check the old handler's state
+    assert second is not first
+    assert first._fd is None
+    assert not first._fd_finalizer.alive
+    assert _fd_is_open(second._fd)
+
+
+def test_setup_logging_does_not_leak_fds(tmp_path, isolated_root_logger, monkeypatch):
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    log_file = str(tmp_path / "app.log")
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        pytest.skip("needs /proc to count open descriptors")
+
+    setup_logging(log_file=log_file, enable_console=False)
+    baseline = len(os.listdir(fd_dir))
+    for _ in range(5):
+        setup_logging(log_file=log_file, enable_console=False)
+    assert len(os.listdir(fd_dir)) == baseline
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        "%(asctime)s %(message)s",
+    ],
+)
+def test_cached_time_formatter_matches_logging_formatter(fmt):
+    cached = CachedTimeFormatter(fmt)
+    reference = logging.Formatter(fmt)
+    # Several records within one second, then across second boundaries
+    for created in (1700000000.0, 1700000000.123, 1700000000.999, 1700000001.5, 1700000001.001, 1700000065.25):
+        record = _record(created)
+        assert cached.format(record) == reference.format(record)
+
+
+def test_cached_time_formatter_honours_datefmt():
+    cached = CachedTimeFormatter("%(asctime)s", datefmt="%Y/%m/%d %H:%M")
+    reference = logging.Formatter("%(asctime)s", datefmt="%Y/%m/%d %H:%M")
+    record = _record(1700000000.5)
+    assert cached.format(record) == reference.format(record)
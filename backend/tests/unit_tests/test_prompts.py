@@ -0,0 +1,22 @@
+import pytest
+
+from agent import prompts
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        prompts.query_writer_instructions,
+        prompts.web_searcher_instructions,
+        prompts.web_search_results_suffix,
+        prompts.reflection_instructions,
+        prompts.answer_instructions,
+        'literal {{braces}} around {x} and {y}{x}',
+    ],
+)
+def test_render_prompt_matches_str_format(template):
+    parts = prompts._parse_template(template)
+    values = {field: f"<{field} ✓>" for _, field in parts if field is not None}
+    values["number_queries"] = 3
+
+    assert prompts.render_prompt(parts, **values) == template.format(**values)
@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent import rag_nodes
+from rag import RAGSearchResult
+from rag._cache import LRUCache
+
+
+@pytest.fixture
+def fake_tool(monkeypatch):
+    """Route retrievals to a fake RAG tool that records its queries."""
+    tool = SimpleNamespace(queries=[], result=RAGSearchResult("ok", "docs"))
+
+    def search(query, max_results):
+        tool.queries.append(query)
+        return tool.result
+
+    async def asearch(query, max_results):
+        return search(query, max_results)
+
+    tool.search = search
+    tool.asearch = asearch
+    monkeypatch.setattr(rag_nodes, "_RAG_ENABLED", True)
+    monkeypatch.setattr(rag_nodes, "create_rag_tool", lambda resources: tool)
+    monkeypatch.setattr(rag_nodes, "_rag_result_cache", LRUCache(maxsize=8, ttl=60))
+    return tool
+
+
+def _state(topic, resources=("rag://dataset/b", "rag://dataset/a")):
+    return {"messages": [{"content": topic}], "rag_resources": list(resources)}
+
+
+def test_repeated_topic_is_served_from_cache(fake_tool):
+    assert rag_nodes.rag_retrieve(_state("Solar  power"), {}) == {"rag_documents": ["docs"], "rag_enabled": True}
+    # Same topic up to case and whitespace, same resources in another order
+    second = asyncio.run(rag_nodes.arag_retrieve(_state("solar power", ("rag://dataset/a", "rag://dataset/b")), {}))
+
+    assert second == {"rag_documents": ["docs"], "rag_enabled": True}
+    assert fake_tool.queries == ["Solar  power"]
+
+
+def test_other_resources_are_searched_separately(fake_tool):
+    rag_nodes.rag_retrieve(_state("solar power"), {})
+    rag_nodes.rag_retrieve(_state("solar power", ("rag://dataset/c",)), {})
+
+    assert len(fake_tool.queries) == 2
+
+
+def test_empty_results_are_not_cached(fake_tool):
+    fake_tool.result = RAGSearchResult("empty", "nothing")
+
+    assert rag_nodes.rag_retrieve(_state("solar power"), {}) == {"rag_documents": [], "rag_enabled": True}
+    rag_nodes.rag_retrieve(_state("solar power"), {})
+
+    assert len(fake_tool.queries) == 2
+
+
+def test_refresh_rebuilds_result_cache_with_current_ttl(fake_tool, monkeypatch):
+    monkeypatch.setattr(rag_nodes.rag_config, "query_cache_ttl", 5.0)
+    rag_nodes.rag_retrieve(_state("solar power"), {})
+
+    rag_nodes.refresh_rag_cache()
+
+    assert rag_nodes._rag_result_cache.ttl == 5.0
+    assert rag_nodes._rag_result_cache.get((("rag://dataset/a", "rag://dataset/b"), "solar power")) is None
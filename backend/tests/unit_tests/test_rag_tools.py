@@ -0,0 +1,50 @@
+import pytest
+
+from rag import rag_config
+from rag.retriever import Chunk, Document
+from rag.tools import RAGSearchTool, _iter_formatted_documents
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    monkeypatch.setattr(rag_config, "similarity_threshold", 0.1)
+    monkeypatch.setattr(rag_config, "similarity_miss_ratio", 0.5)
+    return RAGSearchTool()
+
+
+def _document(*similarities):
+    chunks = [Chunk(content=f"chunk {s}", similarity=s) for s in similarities]
+    return Document(id="doc", title="Doc", chunks=chunks)
+
+
+def test_best_chunk_far_below_threshold_is_a_miss(tool):
+    result = tool._build_result([_document(0.01, 0.04), _document(0.02)])
+    assert result.status == "empty"
+    assert result.content == "No sufficiently relevant information found (best similarity=0.04)."
+
+
+def test_best_chunk_near_threshold_is_formatted_with_fallback_chunks(tool):
+    result = tool._build_result([_document(0.06, 0.01)])
+    assert result.status == "ok"
+    assert "chunk 0.06" in result.content
+    assert "chunk 0.01" in result.content
+
+
+def test_documents_without_chunks_are_a_miss(tool):
+    assert tool._build_result([Document(id="doc", title="Doc")]).status == "empty"
+
+
+def test_formatted_documents_keep_chunks_above_threshold(tool):
+    documents = [_document(0.5, 0.05), Document(id="doc", title="Other", chunks=[Chunk("x", 0.2)])]
+
+    assert list(_iter_formatted_documents(documents)) == [
+        "## Document 1: Doc\n\n**Content:** chunk 0.5\n**Similarity:** 0.500\n\n",
+        "## Document 2: Other\n\n**Content:** x\n**Similarity:** 0.200\n\n",
+    ]
+
+
+def test_formatted_document_below_threshold_falls_back_to_top_three_chunks(tool):
+    [block] = _iter_formatted_documents([_document(0.04, 0.03, 0.02, 0.01)])
+
+    assert block.count("**Content:**") == 3
+    assert "chunk 0.01" not in block
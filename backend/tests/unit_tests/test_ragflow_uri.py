@@ -0,0 +1,36 @@
+import pytest
+
+from rag.ragflow import _parse_uri
+
+
+@pytest.mark.parametrize(
+    "uri, expected",
+    [
+        ("rag://dataset/abc", ("abc", "")),
+        ("rag://dataset/abc#doc-1", ("abc", "doc-1")),
+        ("rag://dataset/abc/", ("abc", "")),
+        # The scheme is case-insensitive, the netloc is not
+        ("RAG://dataset/abc", ("abc", "")),
+        ("rag://DATASET/abc", ("", "")),
+        # Without an authority the dataset is read from the path
+        ("rag:dataset/abc", ("abc", "")),
+        ("rag:///dataset/abc/extra#doc", ("abc", "doc")),
+        ("rag://host/dataset/abc", ("abc", "")),
+        # The query never leaks into the IDs
+        ("rag://dataset/abc?page=1", ("abc", "")),
+        ("rag://dataset/abc?page=1#doc", ("abc", "doc")),
+        # With a dataset netloc the whole path is the ID
+        ("rag://dataset/a/b", ("a/b", "")),
+        ("rag://", ("", "")),
+        ("rag://dataset/", ("", "")),
+        ("rag://other/path", ("", "")),
+    ],
+)
+def test_parse_uri(uri, expected):
+    assert _parse_uri(uri) == expected
+
+
+@pytest.mark.parametrize("uri", ["http://dataset/abc", "rag//dataset/abc", "dataset/abc", ""])
+def test_parse_uri_rejects_other_schemes(uri):
+    with pytest.raises(ValueError):
+        _parse_uri(uri)
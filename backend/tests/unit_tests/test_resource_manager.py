@@ -0,0 +1,77 @@
+import orjson
+import pytest
+
+from agent import resource_manager
+from agent.resource_manager import ResourceManager
+
+
+def _write_config(path, *resources):
+    path.write_bytes(orjson.dumps({"resources": list(resources)}))
+
+
+def _resource(name, enabled=True, uri=None):
+    return {"name": name, "uri": f"rag://dataset/{name}" if uri is None else uri, "title": name.title(), "enabled": enabled}
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(resource_manager, "is_rag_enabled", lambda: True)
+    path = tmp_path / "resources.json"
+    _write_config(path, _resource("a"), _resource("b", enabled=False), _resource("c"))
+    return path
+
+
+def test_enabled_resources_follow_in_place_toggles(config_path):
+    manager = ResourceManager(str(config_path))
+    assert [r.name for r in manager.list_resources()] == ["a", "c"]
+
+    manager.resources["a"].enabled = False
+    manager.resources["b"].enabled = True
+
+    assert [r.name for r in manager.list_resources()] == ["b", "c"]
+    assert [r.uri for r in manager.get_rag_resources(["a", "b", "missing"])] == ["rag://dataset/b"]
+    assert manager.get_resource_stats()["enabled_resources"] == 2
+
+
+def test_save_skips_unchanged_resources_and_writes_edits(config_path):
+    manager = ResourceManager(str(config_path))
+    config_path.write_bytes(b"sentinel")
+
+    manager.save_resources()
+    assert config_path.read_bytes() == b"sentinel"
+
+    manager.resources["a"].description = "edited in place"
+    manager.save_resources()
+    assert ResourceManager(str(config_path)).resources["a"].description == "edited in place"
+
+
+def test_save_rewrites_a_deleted_config_file(config_path):
+    manager = ResourceManager(str(config_path))
+    config_path.unlink()
+
+    manager.save_resources()
+
+    assert list(ResourceManager(str(config_path)).resources) == ["a", "b", "c"]
+
+
+def test_validate_resources_uses_the_prefix_rule(config_path):
+    _write_config(
+        config_path,
+        _resource("ok"),
+        _resource("bare", uri="rag://"),
+        _resource("spaced", uri="rag://my docs"),
+        _resource("http", uri="http://example.com"),
+        _resource("empty", uri=""),
+        {**_resource("untitled"), "title": ""},
+    )
+
+    assert ResourceManager(str(config_path)).validate_resources() == {
+        "http": ["URI should start with 'rag://'"],
+        "empty": ["URI is empty"],
+        "untitled": ["Title is empty"],
+    }
+
+
+def test_config_is_not_read_when_rag_is_disabled(config_path, monkeypatch):
+    monkeypatch.setattr(resource_manager, "is_rag_enabled", lambda: False)
+    assert ResourceManager(str(config_path)).resources == {}
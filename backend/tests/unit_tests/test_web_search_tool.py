@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agent.web_search_tool import SearchConfig, WebSearchTool
+
+_RESULT_HTML = """
+<div class="result">
+  <a class="result__a" href="/l/?uddg=https%3A%2F%2Fexample.com%2F{name}">Title {name}</a>
+  <a class="result__snippet">Snippet {name}</a>
+</div>
+"""
+
+
+def _duckduckgo_get(failing=()):
+    """Fake session.get that serves one result per query and fails for some."""
+    calls = []
+
+    def get(url, **kwargs):
+        query = url.rsplit("q=", 1)[1]
+        calls.append(query)
+        if query in failing:
+            raise ConnectionError(f"boom {query}")
+        return SimpleNamespace(text=_RESULT_HTML.format(name=query), raise_for_status=lambda: None)
+
+    get.calls = calls
+    return get
+
+
+@pytest.fixture
+def tool():
+    return WebSearchTool(SearchConfig(search_engine="duckduckgo"))
+
+
+def test_search_batch_preserves_query_order_with_cached_entries(tool, monkeypatch):
+    monkeypatch.setattr(tool._session, "get", _duckduckgo_get())
+    tool.search("b")
+
+    results = tool.search_batch(["c", "b", "a", "c"])
+
+    assert list(results) == ["c", "b", "a"]
+    assert [r[0]["url"] for r in results.values()] == [
+        "https://example.com/c",
+        "https://example.com/b",
+        "https://example.com/a",
+    ]
+
+
+def test_search_batch_fetches_each_distinct_miss_once(tool, monkeypatch):
+    get = _duckduckgo_get()
+    monkeypatch.setattr(tool._session, "get", get)
+    tool.search("a")
+
+    tool.search_batch(["a", "b", "b", "c"])
+
+    assert sorted(get.calls) == ["a", "b", "c"]
+
+
+def test_search_batch_isolates_failures(tool, monkeypatch):
+    monkeypatch.setattr(tool._session, "get", _duckduckgo_get(failing={"bad"}))
+
+    results = tool.search_batch(["good", "bad", "other"])
+
+    assert results["good"][0]["title"] == "Title good"
+    assert results["other"][0]["title"] == "Title other"
+    # The failed query gets the fallback link, but only [] is cached (short TTL)
+    assert results["bad"][0]["snippet"] == "DuckDuckGo search result (fallback mode)"
+    assert tool._cache.get(tool._cache_key("bad", 5)) == []
+
+
+def test_failed_duckduckgo_search_is_retried_after_short_ttl(tool, monkeypatch):
+    get = _duckduckgo_get(failing={"flaky"})
+    monkeypatch.setattr(tool._session, "get", get)
+
+    stub = tool.search("flaky")
+    assert stub[0]["snippet"] == "DuckDuckGo search result (fallback mode)"
+
+    # Once the negative entry is gone the query is fetched again
+    tool._cache.pop(tool._cache_key("flaky", 5))
+    monkeypatch.setattr(tool._session, "get", _duckduckgo_get())
+    assert tool.search("flaky")[0]["title"] == "Title flaky"
+
+
+def test_api_engine_failure_returns_empty_results(monkeypatch, caplog):
+    tool = WebSearchTool(SearchConfig(search_engine="tavily", tavily_api_key="key"))
+
+    def request(*args, **kwargs):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(tool._session, "request", request)
+
+    assert tool.search_batch(["q1", "q2"]) == {"q1": [], "q2": []}
+    assert "Tavily search failed: down" in caplog.text
@@ -7,11 +7,14 @@ import os
 import shutil
 from pathlib import Path
 
+BACKEND_DIR = Path("backend")
+ENV_FILE = BACKEND_DIR / ".env"
+BACKUP_FILE = BACKEND_DIR / ".env.backup"
+
 def fix_env_encoding():
     """修复 .env 文件的编码问题"""
-    backend_dir = Path("backend")
-    env_file = backend_dir / ".env"
-    backup_file = backend_dir / ".env.backup"
+    env_file = ENV_FILE
+    backup_file = BACKUP_FILE
     
     if not env_file.exists():
         print("❌ .env 文件不存在")
@@ -23,14 +26,15 @@ def fix_env_encoding():
         shutil.copy2(env_file, backup_file)
         print(f"✅ 备份完成: {backup_file}")
         
-        # 2. 尝试用不同编码读取文件
+        # 2. 尝试用不同编码解码文件（只读取一次原始字节）
         content = None
         encodings = ['utf-8', 'gbk', 'gb2312', 'latin-1']
+        raw = env_file.read_bytes()
         
         for encoding in encodings:
             try:
-                with open(env_file, 'r', encoding=encoding) as f:
-                    content = f.read()
+                # 与文本模式读取一致：统一换行符为 \n
+                content = raw.decode(encoding).replace('\r\n', '\n').replace('\r', '\n')
                 print(f"✅ 使用 {encoding} 编码成功读取文件")
                 break
             except UnicodeDecodeError:
@@ -65,8 +69,7 @@ def fix_env_encoding():
 
 def create_clean_env():
     """创建一个干净的 .env 文件模板"""
-    backend_dir = Path("backend")
-    env_file = backend_dir / ".env"
+    env_file = ENV_FILE
     
     # 基于之前的配置创建干净的模板
     clean_env_content = """# ===========================================
@@ -121,8 +124,8 @@ def main():
     print("🔧 .env 文件编码修复工具")
     print("=" * 40)
     
-    backend_dir = Path("backend")
-    env_file = backend_dir / ".env"
+    backend_dir = BACKEND_DIR
+    env_file = ENV_FILE
     
     if not backend_dir.exists():
         print("❌ backend 目录不存在")
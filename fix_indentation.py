@@ -6,6 +6,36 @@
 import re
 from pathlib import Path
 
+# 需要修复的错误缩进片段及其修正版本
+OLD_PATTERNS = (
+    # 修复第14行的缩进错误
+    """        else:
+        content = messages[-1].content""",
+    # 修复第28行的缩进错误
+    """            else:
+            content = str(message.content) if message.content else ""
+            if isinstance(message, HumanMessage):""",
+    # 还需要修复相关的其他行
+    """                research_topic += f"User: {content}\n"
+                elif isinstance(message, AIMessage):
+                    research_topic += f"Assistant: {content}\n" """,
+)
+
+NEW_PATTERNS = (
+    """        else:
+            content = messages[-1].content""",
+    """            else:
+                content = str(message.content) if message.content else ""
+                if isinstance(message, HumanMessage):""",
+    """                    research_topic += f"User: {content}\n"
+                elif isinstance(message, AIMessage):
+                    research_topic += f"Assistant: {content}\n" """,
+)
+
+# 单个预编译正则，一次扫描完成全部替换
+_FIX_RE = re.compile("|".join(re.escape(p) for p in OLD_PATTERNS))
+_FIX_MAP = dict(zip(OLD_PATTERNS, NEW_PATTERNS))
+
 def fix_indentation():
     """修复 utils.py 文件的缩进错误"""
     utils_file = Path("backend/src/agent/utils.py")
@@ -16,44 +46,13 @@ def fix_indentation():
     
     try:
         # 读取文件内容
-        with open(utils_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 修复第14行的缩进错误
-        # 查找并替换错误的缩进
-        old_pattern1 = """        else:
-        content = messages[-1].content"""
-        
-        new_pattern1 = """        else:
-            content = messages[-1].content"""
-        
-        # 修复第28行的缩进错误
-        old_pattern2 = """            else:
-            content = str(message.content) if message.content else ""
-            if isinstance(message, HumanMessage):"""
-        
-        new_pattern2 = """            else:
-                content = str(message.content) if message.content else ""
-                if isinstance(message, HumanMessage):"""
+        content = utils_file.read_text(encoding='utf-8')
         
         # 执行替换
-        content = content.replace(old_pattern1, new_pattern1)
-        content = content.replace(old_pattern2, new_pattern2)
-        
-        # 还需要修复相关的其他行
-        old_pattern3 = """                research_topic += f"User: {content}\n"
-                elif isinstance(message, AIMessage):
-                    research_topic += f"Assistant: {content}\n" """
-        
-        new_pattern3 = """                    research_topic += f"User: {content}\n"
-                elif isinstance(message, AIMessage):
-                    research_topic += f"Assistant: {content}\n" """
-        
-        content = content.replace(old_pattern3, new_pattern3)
+        content = _FIX_RE.sub(lambda m: _FIX_MAP[m.group(0)], content)
         
         # 写回文件
-        with open(utils_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        utils_file.write_text(content, encoding='utf-8')
         
         print("✅ utils.py 缩进错误修复完成")
         return True